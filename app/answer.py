@@ -1,3 +1,5 @@
+from typing import List
+
 from app.guardrails import (
     compact_snippet,
     format_citation,
@@ -5,11 +7,14 @@ from app.guardrails import (
     is_confident,
     unsupported_response,
 )
-from app.retrieve import Retriever
+from app.retrieve import RetrievedChunk, Retriever
 
 
 def answer_question(question: str, retriever: Retriever) -> str:
-    results = retriever.search(question, top_k=3)
+    return format_answer(retriever.search(question, top_k=3))
+
+
+def format_answer(results: List[RetrievedChunk]) -> str:
     if not results:
         return unsupported_response()
 
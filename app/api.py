@@ -1,14 +1,26 @@
 from dataclasses import asdict
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+import hashlib
+import hmac
+import os
+import threading
+import time
 import uuid
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from app.guide import GuideEngine
-from app.index import ensure_index
+from app.guide import GuideEngine, PrefetchPool, TurnCache
+from app.index import current_version, ensure_index
+from app.profiling import RequestProfiler, memory_report, start_tracemalloc
+from app.reqlog import LOG_DIR, REQUEST_LOG_FILE_NAME, RequestLog
 from app.retrieve import Retriever
+from app.shards import ShardedRetriever
+from app.warmup import frequent_queries, warm
 
 
 app = FastAPI(title="Blueprint Buddy API")
@@ -23,14 +35,149 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Admin (profiling) endpoints answer 404 unless BP_ADMIN_TOKEN is set, and
+# then require it in the X-Admin-Token header.
+ADMIN_TOKEN = os.environ.get("BP_ADMIN_TOKEN")
+if os.environ.get("BP_TRACEMALLOC") == "1":
+    # Started before the index loads so its memory is attributed too.
+    start_tracemalloc()
+PROFILER = RequestProfiler()
+
+# Search the shards of a sharded index (`python -m app.index --shards N`) in
+# worker processes; without BP_SHARD_PROCESSES=1 they are searched in-process.
+SHARD_PROCESSES = os.environ.get("BP_SHARD_PROCESSES") == "1"
+
+
+def _open_retriever(version: Optional[str] = None) -> Retriever:
+    return ShardedRetriever(version) if SHARD_PROCESSES else Retriever(version)
+
 
 ensure_index()
-RETRIEVER = Retriever()
+RETRIEVER = _open_retriever()
+TURN_CACHE = TurnCache()
+# Runs the next step's prompt searches while the user is typing an answer.
+PREFETCH_POOL = PrefetchPool()
+# Structured /chat and /compare logs under logs/; set BP_REQUEST_LOG=0 to disable.
+REQUEST_LOG = RequestLog() if os.environ.get("BP_REQUEST_LOG", "1") != "0" else None
+# Before reporting ready, and before swapping in a newly published index
+# version, replay the most frequent logged queries; BP_WARMUP=0 skips it.
+WARMUP_ENABLED = os.environ.get("BP_WARMUP", "1") != "0"
+INDEX_POLL_SECONDS = 30
+READY = threading.Event()
+WARMED_QUERIES = 0
+# Retrievers replaced by a swap. Every session is moved to the new one at the
+# swap; a retired retriever is closed on a later poll, once nothing uses it.
+RETIRED: List[Retriever] = []
+
+# Chunk IDs are content hashes, so a chunk's text never changes under its ID;
+# the ETag still follows the index version because the set of known IDs does.
+CHUNKS_MAX_IDS = 50
+CHUNKS_MAX_AGE_SECONDS = 3600
+
+
+def _warm(retriever: Retriever) -> int:
+    if isinstance(retriever, ShardedRetriever):
+        # Spawn the shard workers and load their shards before serving, so
+        # the first searches do not spend their deadline on startup.
+        retriever.start()
+    if not WARMUP_ENABLED:
+        return 0
+    paths = REQUEST_LOG.rotated_paths() if REQUEST_LOG is not None else [LOG_DIR / REQUEST_LOG_FILE_NAME]
+    return warm(retriever, frequent_queries(paths))
+
+
+def _close_retired() -> None:
+    """Close retired retrievers that no session is bound to any more.
+
+    Runs a poll interval after the swap at the earliest, so requests that
+    read the old `RETRIEVER` just before the swap have finished with it.
+    Sessions are rebound at the swap; the check only catches one created
+    from the old retriever while the swap ran.
+    """
+    bound = {id(session.engine.retriever) for session in list(SESSIONS.values())}
+    for retriever in list(RETIRED):
+        if id(retriever) not in bound:
+            RETIRED.remove(retriever)
+            retriever.close()
+
+
+def _swap(retriever: Retriever, warmed: int) -> None:
+    """Serve `retriever` from now on and retire the current one."""
+    global RETRIEVER, WARMED_QUERIES
+    RETIRED.append(RETRIEVER)
+    RETRIEVER, WARMED_QUERIES = retriever, warmed
+    # Idle sessions would otherwise keep the old index (postings, chunk
+    # store, lease, shard workers) alive for as long as they exist.
+    for session in list(SESSIONS.values()):
+        session.engine.rebind(retriever)
+
+
+def _watch_index() -> None:
+    """Warm the startup index, then pick up (and warm) newly published versions."""
+    global WARMED_QUERIES
+    WARMED_QUERIES = _warm(RETRIEVER)
+    READY.set()
+    while True:
+        time.sleep(INDEX_POLL_SECONDS)
+        _close_retired()
+        version = current_version()
+        if version is None or version == RETRIEVER.version:
+            continue
+        try:
+            retriever = _open_retriever(version)
+            warmed = _warm(retriever)
+        except (OSError, ValueError, KeyError, RuntimeError):
+            # The version vanished or is unreadable; keep serving the old one.
+            continue
+        _swap(retriever, warmed)
+
+
+@app.on_event("startup")
+def start_index_watcher() -> None:
+    threading.Thread(target=_watch_index, name="index-watcher", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def close_resources() -> None:
+    if REQUEST_LOG is not None:
+        REQUEST_LOG.close()
+    PREFETCH_POOL.shutdown()
+    for retriever in RETIRED + [RETRIEVER]:
+        retriever.close()
+
+
+def _log_turn(endpoint: str, session_id: str, engine: GuideEngine, step: str, timings: Dict[str, float]) -> None:
+    if REQUEST_LOG is None:
+        return
+    search_ms = sum(search["ms"] for search in engine.trace)
+    REQUEST_LOG.log(
+        {
+            "ts": datetime.utcnow().isoformat() + "Z",
+            "endpoint": endpoint,
+            "session_id": session_id,
+            "index_version": RETRIEVER.version,
+            "step": step,
+            "cached": engine.cached,
+            "partial": engine.partial,
+            "searches": engine.trace,
+            "timings_ms": {
+                "search": round(search_ms, 3),
+                **{name: round(seconds * 1000, 3) for name, seconds in timings.items()},
+            },
+        }
+    )
 
 
 class Session:
     def __init__(self) -> None:
-        self.engine = GuideEngine(RETRIEVER)
+        self.engine = GuideEngine(RETRIEVER, TURN_CACHE)
+
+    def current_engine(self) -> GuideEngine:
+        """The session's engine, moved to the current index version if it was swapped."""
+        self.engine.rebind(RETRIEVER)
+        return self.engine
 
 
 SESSIONS: Dict[str, Session] = {}
@@ -42,6 +189,9 @@ class SessionResponse(BaseModel):
     draft_snapshot: Optional[dict] = None
     step: Optional[str] = None
     evidence: Optional[List[dict]] = None
+    # True when a search hit its latency budget and the reply uses the best
+    # results found so far.
+    partial: Optional[bool] = None
 
 
 class ChatRequest(BaseModel):
@@ -66,18 +216,32 @@ class CompareRequest(BaseModel):
     variant: CompareVariant
 
 
+class ProfileRequest(BaseModel):
+    mode: str = "sample"
+    requests: int = 20
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
 @app.post("/session", response_model=SessionResponse)
 def create_session() -> SessionResponse:
     session_id = str(uuid.uuid4())
     session = Session()
     SESSIONS[session_id] = session
     prompt, evidence, step = session.engine.start_prompt()
+    session.engine.prefetch(PREFETCH_POOL)
     return SessionResponse(
         session_id=session_id,
         reply=prompt,
         draft_snapshot=asdict(session.engine.state.spec),
         step=step,
         evidence=evidence or None,
+        partial=session.engine.partial or None,
     )
 
 
@@ -86,23 +250,76 @@ def root() -> dict:
     return {
         "ok": True,
         "docs": "/docs",
-        "endpoints": ["/session", "/chat", "/reset", "/compare"],
+        "index_version": RETRIEVER.version,
+        "corpora": RETRIEVER.corpora,
+        "endpoints": ["/session", "/chat", "/reset", "/compare", "/chunks", "/ready"],
     }
 
 
+@app.get("/ready")
+def ready() -> JSONResponse:
+    payload = {"ready": READY.is_set(), "index_version": RETRIEVER.version, "warmed_queries": WARMED_QUERIES}
+    return JSONResponse(payload, status_code=200 if READY.is_set() else 503)
+
+
+@app.get("/chunks")
+def get_chunks(ids: str, request: Request) -> Response:
+    chunk_ids = list(dict.fromkeys(part.strip() for part in ids.split(",") if part.strip()))
+    if len(chunk_ids) > CHUNKS_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {CHUNKS_MAX_IDS} chunk IDs per request.")
+
+    key = f"{RETRIEVER.version}:{','.join(sorted(chunk_ids))}"
+    etag = '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CHUNKS_MAX_AGE_SECONDS}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    chunks = []
+    missing = []
+    for chunk_id in chunk_ids:
+        doc = RETRIEVER.get_chunk(chunk_id)
+        if doc is None:
+            missing.append(chunk_id)
+            continue
+        chunks.append(
+            {
+                "chunk_id": chunk_id,
+                "repo": doc["repo"],
+                "file_path": doc["file_path"],
+                "line_range": f"L{doc['start_line']}-L{doc['end_line']}",
+                "text": doc["text"],
+            }
+        )
+    payload = {"index_version": RETRIEVER.version, "chunks": chunks, "missing": missing}
+    return JSONResponse(payload, headers=headers)
+
+
 @app.post("/chat", response_model=SessionResponse)
 def chat(request: ChatRequest) -> SessionResponse:
     session = SESSIONS.get(request.session_id)
     if not session:
         return SessionResponse(session_id=request.session_id)
 
-    reply, evidence, step = session.engine.handle_message(request.message)
+    started = time.perf_counter()
+    session.current_engine()
+    with PROFILER.request():
+        reply, evidence, step = session.engine.handle_message(request.message)
+    handled = time.perf_counter()
+    session.engine.prefetch(PREFETCH_POOL)
+    _log_turn(
+        "/chat",
+        request.session_id,
+        session.engine,
+        step,
+        {"handle": handled - started, "total": time.perf_counter() - started},
+    )
     return SessionResponse(
         session_id=request.session_id,
         reply=reply,
         draft_snapshot=asdict(session.engine.state.spec),
         step=step,
         evidence=evidence or None,
+        partial=session.engine.partial or None,
     )
 
 
@@ -114,12 +331,14 @@ def reset(request: ResetRequest) -> SessionResponse:
     if not session:
         return SessionResponse(session_id=request.session_id)
     prompt, evidence, step = session.engine.start_prompt()
+    session.engine.prefetch(PREFETCH_POOL)
     return SessionResponse(
         session_id=request.session_id,
         reply=prompt,
         draft_snapshot=asdict(session.engine.state.spec),
         step=step,
         evidence=evidence or None,
+        partial=session.engine.partial or None,
     )
 
 
@@ -129,32 +348,74 @@ def compare(request: CompareRequest) -> SessionResponse:
     if not session:
         return SessionResponse(session_id=request.session_id)
 
-    clone = session.engine.clone()
-    reply, evidence, step = clone.handle_message(request.message)
-    reply, evidence = apply_variant(reply, evidence or [], request.variant)
+    started = time.perf_counter()
+    with PROFILER.request():
+        clone = session.current_engine().clone()
+        reply, evidence, step = clone.handle_message(request.message)
+        handled = time.perf_counter()
+        reply, evidence = apply_variant(reply, evidence or [], request.variant)
+    finished = time.perf_counter()
+    _log_turn(
+        "/compare",
+        request.session_id,
+        clone,
+        step,
+        {"handle": handled - started, "variant": finished - handled, "total": finished - started},
+    )
     return SessionResponse(
         session_id=request.session_id,
         reply=reply,
         draft_snapshot=asdict(clone.state.spec),
         step=step,
         evidence=evidence or None,
+        partial=clone.partial or None,
     )
 
 
+@app.post("/admin/profile")
+def start_profile(request: ProfileRequest, x_admin_token: Optional[str] = Header(default=None)) -> dict:
+    _require_admin(x_admin_token)
+    try:
+        PROFILER.arm(request.mode, request.requests)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return PROFILER.report()
+
+
+@app.get("/admin/profile")
+def get_profile(x_admin_token: Optional[str] = Header(default=None)) -> dict:
+    _require_admin(x_admin_token)
+    return PROFILER.report()
+
+
+@app.get("/admin/memory")
+def get_memory(x_admin_token: Optional[str] = Header(default=None)) -> dict:
+    _require_admin(x_admin_token)
+    report = memory_report()
+    report["counts"] = {
+        "sessions": len(SESSIONS),
+        "turn_cache_entries": len(TURN_CACHE._entries),
+        **RETRIEVER.cache_stats(),
+    }
+    if REQUEST_LOG is not None:
+        report["request_log"] = REQUEST_LOG.stats()
+    return report
+
+
 def _parse_line_range(line_range: str) -> Tuple[int, int]:
     start, end = line_range.replace("L", "").split("-L")
     return int(start), int(end)
 
 
-def _find_chunk_text(file_path: str, line_range: str) -> Optional[str]:
+def _find_chunk_text(file_path: str, line_range: str, chunk_id: Optional[str] = None) -> Optional[str]:
+    doc = RETRIEVER.get_chunk(chunk_id) if chunk_id else None
+    if doc is not None:
+        return doc["text"]
     try:
         start, end = _parse_line_range(line_range)
     except ValueError:
         return None
-    for doc in RETRIEVER._docs:
-        if doc["file_path"] == file_path and doc["start_line"] == start and doc["end_line"] == end:
-            return doc["text"]
-    return None
+    return RETRIEVER.find_chunk_text(file_path, start, end)
 
 
 def _truncate_blocks(text: str, max_blocks: int) -> str:
@@ -184,7 +445,7 @@ def apply_variant(reply: str, evidence: List[dict], variant: CompareVariant) ->
     if variant.expression_style.lower() == "concrete":
         if adjusted_evidence:
             first = adjusted_evidence[0]
-            snippet = _find_chunk_text(first["file_path"], first["line_range"])
+            snippet = _find_chunk_text(first["file_path"], first["line_range"], first.get("chunk_id"))
             if snippet:
                 lines = "\n".join(snippet.splitlines()[:4])
                 adjusted += f"\n\nQuoted evidence:\n{lines}"
@@ -0,0 +1,228 @@
+"""Non-interactive runs over many inputs against one index version.
+
+Work is spread over a process pool; each worker loads the pinned index
+version once, in its initializer, and keeps it for every item it handles.
+"""
+import json
+import multiprocessing
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, TextIO
+
+from app.answer import format_answer
+from app.guardrails import format_citation, is_confident
+from app.guide import GuideEngine, TurnCache
+from app.retrieve import Retriever
+from app.schema import export_spec
+
+BATCH_WORKERS = 4
+BATCH_TOP_K = 3
+# Spawned like the shard workers: the CLI has already started its index loader thread.
+BATCH_START_METHOD = "spawn"
+# Characters kept when a script id becomes part of a spec file name.
+SPEC_NAME_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Per worker process: the index it searches and, for replays, its turn cache.
+_WORKER_RETRIEVER: Optional[Retriever] = None
+_WORKER_TURN_CACHE: Optional[TurnCache] = None
+
+
+def _init_worker(version: str) -> None:
+    global _WORKER_RETRIEVER, _WORKER_TURN_CACHE
+    _WORKER_RETRIEVER = Retriever(version)
+    _WORKER_TURN_CACHE = TurnCache()
+
+
+def _pool(workers: int, version: str) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context(BATCH_START_METHOD),
+        initializer=_init_worker,
+        initargs=(version,),
+    )
+
+
+def read_questions(path: Path) -> List[dict]:
+    """Read questions from a JSONL file (`{"question": ..., "id": ...}`) or plain text.
+
+    Lines starting with `{` are parsed as JSON; any other non-empty line is a
+    question on its own. Questions without an `id` are numbered by line. A
+    line that is not valid JSON becomes an `{"id": <line>, "error": ...}` item.
+    """
+    questions: List[dict] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("{"):
+                item = {"question": line}
+            else:
+                try:
+                    item = json.loads(line)
+                except ValueError as exc:
+                    item = {"error": f"invalid JSON: {exc}"}
+                if not isinstance(item, dict):
+                    item = {"error": "expected a JSON object"}
+            item.setdefault("id", line_number)
+            questions.append(item)
+    return questions
+
+
+def answer_record(item: dict, retriever: Retriever, top_k: int = BATCH_TOP_K) -> dict:
+    if "error" in item:
+        return {"id": item["id"], "error": item["error"]}
+    if not isinstance(item.get("question"), str):
+        return {"id": item["id"], "error": "missing \"question\""}
+    started = time.perf_counter()
+    results = retriever.search(item["question"], top_k=top_k)
+    answer = format_answer(results)
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {
+        "id": item["id"],
+        "question": item["question"],
+        "answer": answer,
+        "citations": [format_citation(chunk) for chunk in results],
+        "chunk_ids": [chunk.chunk_id for chunk in results],
+        "scores": [round(chunk.score, 6) for chunk in results],
+        "confident": is_confident(results),
+        "partial": getattr(results, "partial", False),
+        "latency_ms": round(latency_ms, 3),
+    }
+
+
+@contextmanager
+def open_output(path: Optional[Path]) -> Iterator[TextIO]:
+    if path is None:
+        yield sys.stdout
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        yield handle
+
+
+def _answer(item: dict) -> dict:
+    return answer_record(item, _WORKER_RETRIEVER)
+
+
+def run_batch_ask(
+    questions: List[dict],
+    version: str,
+    output: TextIO,
+    workers: int = BATCH_WORKERS,
+) -> int:
+    """Answer `questions` against index `version` on a process pool, one JSON line each.
+
+    Results are written in input order as soon as each is ready; items
+    without a question get an `{"id", "error"}` line. Returns the number of
+    lines written.
+    """
+    written = 0
+    with _pool(workers, version) as executor:
+        for record in executor.map(_answer, questions):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            written += 1
+    return written
+
+
+def read_scripts(path: Path) -> List[dict]:
+    """Read guide scripts, one JSON line each: `{"id": ..., "answers": [...]}` or a bare list.
+
+    Lines that are not valid JSON, or hold anything else, become
+    `{"id": <line>, "error": ...}` items.
+    """
+    scripts: List[dict] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as exc:
+                item = {"error": f"invalid JSON: {exc}"}
+            if isinstance(item, list):
+                item = {"answers": item}
+            elif not isinstance(item, dict):
+                item = {"error": "expected a JSON object or list"}
+            item.setdefault("id", line_number)
+            scripts.append(item)
+    return scripts
+
+
+def replay_script(
+    item: dict,
+    retriever: Retriever,
+    turn_cache: Optional[TurnCache] = None,
+    spec_dir: Optional[Path] = None,
+    number: int = 1,
+) -> dict:
+    """Run one scripted conversation through a headless `GuideEngine`.
+
+    Answers are fed in order until the guide completes or the script runs
+    out; leftover answers are ignored. Scripts without an answer list get an
+    `{"id", "error"}` record. Exported files are named `spec_<number>_<id>`:
+    `number` is the script's position in the run, so two scripts never share
+    a file even when their ids repeat or clean to the same name.
+    """
+    if "error" in item:
+        return {"id": item["id"], "error": item["error"]}
+    if not isinstance(item.get("answers"), list):
+        return {"id": item["id"], "error": "missing \"answers\" list"}
+    started = time.perf_counter()
+    engine = GuideEngine(retriever, turn_cache)
+    _, _, step = engine.start_prompt()
+    steps = [step]
+    for answer in item["answers"]:
+        if engine.state.complete:
+            break
+        _, _, step = engine.handle_message(str(answer))
+        steps.append(step)
+    latency_ms = (time.perf_counter() - started) * 1000
+
+    record = {
+        "id": item["id"],
+        "spec": engine.state.spec.to_dict(),
+        "complete": engine.state.complete,
+        "steps": steps,
+        "latency_ms": round(latency_ms, 3),
+    }
+    if spec_dir is not None:
+        safe_id = SPEC_NAME_UNSAFE_RE.sub("_", str(item["id"])).strip(".")
+        name = f"{number:04d}_{safe_id}" if safe_id else f"{number:04d}"
+        json_path, md_path = export_spec(engine.state.spec, spec_dir, name=name)
+        record["files"] = [str(json_path), str(md_path)]
+    return record
+
+
+def _replay(item: dict, spec_dir: Optional[Path], number: int) -> dict:
+    return replay_script(item, _WORKER_RETRIEVER, _WORKER_TURN_CACHE, spec_dir, number)
+
+
+def run_replay(
+    scripts: List[dict],
+    version: str,
+    output: TextIO,
+    workers: int = BATCH_WORKERS,
+    spec_dir: Optional[Path] = None,
+) -> int:
+    """Replay `scripts` against index `version` on a process pool, one JSON line per draft.
+
+    The engines in a worker share its `TurnCache`, so scripts that open with
+    the same answers compute those turns once per worker. Returns the number
+    of lines written.
+    """
+    written = 0
+    with _pool(workers, version) as executor:
+        numbers = range(1, len(scripts) + 1)
+        records = executor.map(_replay, scripts, [spec_dir] * len(scripts), numbers)
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            written += 1
+    return written
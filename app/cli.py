@@ -1,18 +1,72 @@
 import argparse
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from app import index as indexer
-from app.answer import answer_question
-from app.guide import run_guide
-from app.retrieve import Retriever
-from app.schema import export_spec
+# Started before the app imports so --timings can report what they cost.
+_IMPORT_STARTED = time.perf_counter()
+
+from app import index as indexer  # noqa: E402
+
+if TYPE_CHECKING:
+    from app.retrieve import Retriever
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = PROJECT_ROOT / "output"
 
 
-def run_ask(retriever: Retriever) -> None:
+class BackgroundRetriever:
+    """Builds a `Retriever` on a worker thread; the first search waits for it."""
+
+    def __init__(self) -> None:
+        self.load_seconds = 0.0
+        self.wait_seconds = 0.0
+        self._retriever: Optional["Retriever"] = None
+        self._error: Optional[BaseException] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._load, name="index-loader", daemon=True)
+        self._thread.start()
+
+    def _load(self) -> None:
+        started = time.perf_counter()
+        try:
+            from app.retrieve import Retriever
+
+            self._retriever = Retriever()
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            self.load_seconds = time.perf_counter() - started
+            self._ready.set()
+
+    @property
+    def loaded(self) -> bool:
+        return self._ready.is_set()
+
+    def get(self) -> "Retriever":
+        if not self._ready.is_set():
+            started = time.perf_counter()
+            self._ready.wait()
+            self.wait_seconds += time.perf_counter() - started
+        if self._error is not None:
+            raise self._error
+        return self._retriever
+
+    def search(self, *args, **kwargs):
+        return self.get().search(*args, **kwargs)
+
+
+def _report(enabled: bool, message: str) -> None:
+    if enabled:
+        print(f"[timing] {message}", file=sys.stderr, flush=True)
+
+
+def run_ask(retriever: "Retriever") -> None:
+    from app.answer import answer_question
+
     print("Ask mode: type your question (or 'exit').")
     while True:
         question = input("> ").strip()
@@ -29,7 +83,7 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Blueprint Buddy CLI")
     parser.add_argument(
         "--mode",
-        choices=["guide", "ask"],
+        choices=["guide", "ask", "replay"],
         default="guide",
         help="chat mode",
     )
@@ -38,24 +92,95 @@ def main() -> None:
         action="store_true",
         help="rebuild the local index",
     )
+    parser.add_argument(
+        "--questions",
+        type=Path,
+        help="ask mode: answer every question in this JSONL/text file instead of prompting",
+    )
+    parser.add_argument(
+        "--scripts",
+        type=Path,
+        help="replay mode: JSONL file of scripted guide answers, one conversation per line",
+    )
+    parser.add_argument(
+        "--spec-dir",
+        type=Path,
+        help="replay mode: also export each spec draft as JSON/Markdown files here",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="write batch results as JSONL to this file (default: stdout)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for batch runs (default: app.batch.BATCH_WORKERS)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="report import, startup and index load times on stderr",
+    )
     args = parser.parse_args()
+    if args.mode == "replay" and not args.scripts:
+        parser.error("--mode replay requires --scripts")
+    if args.questions and args.mode != "ask":
+        parser.error("--questions requires --mode ask")
+    _report(args.timings, f"imports {(time.perf_counter() - _IMPORT_STARTED) * 1000:.1f} ms")
 
     if args.reindex:
+        started = time.perf_counter()
         chunks = indexer.build_index()
         indexer.write_index(chunks)
+        _report(args.timings, f"reindex {(time.perf_counter() - started) * 1000:.1f} ms")
     else:
         indexer.ensure_index()
 
-    retriever = Retriever()
+    retriever = BackgroundRetriever()
+    _report(args.timings, f"startup {(time.perf_counter() - _IMPORT_STARTED) * 1000:.1f} ms")
 
-    if args.mode == "guide":
-        spec = run_guide(retriever)
-        json_path, md_path = export_spec(spec, OUTPUT_DIR)
-        print("Spec draft saved:")
-        print(f"- {json_path}")
-        print(f"- {md_path}")
-    else:
-        run_ask(retriever)
+    try:
+        if args.mode == "guide":
+            from app.guide import run_guide
+            from app.schema import export_spec
+
+            spec = run_guide(retriever)
+            json_path, md_path = export_spec(spec, OUTPUT_DIR)
+            print("Spec draft saved:")
+            print(f"- {json_path}")
+            print(f"- {md_path}")
+        elif args.mode == "replay":
+            from app.batch import BATCH_WORKERS, open_output, read_scripts, run_replay
+
+            scripts = read_scripts(args.scripts)
+            # Workers load the version this process has pinned (and leased).
+            version = retriever.get().version
+            started = time.perf_counter()
+            with open_output(args.output) as output:
+                count = run_replay(
+                    scripts, version, output, workers=args.workers or BATCH_WORKERS, spec_dir=args.spec_dir
+                )
+            _report(args.timings, f"replay {count} scripts {(time.perf_counter() - started) * 1000:.1f} ms")
+        elif args.questions:
+            from app.batch import BATCH_WORKERS, open_output, read_questions, run_batch_ask
+
+            questions = read_questions(args.questions)
+            # Workers load the version this process has pinned (and leased).
+            version = retriever.get().version
+            started = time.perf_counter()
+            with open_output(args.output) as output:
+                count = run_batch_ask(questions, version, output, workers=args.workers or BATCH_WORKERS)
+            _report(args.timings, f"batch {count} questions {(time.perf_counter() - started) * 1000:.1f} ms")
+        else:
+            run_ask(retriever)
+    finally:
+        if retriever.loaded:
+            _report(
+                args.timings,
+                f"index load {retriever.load_seconds * 1000:.1f} ms "
+                f"(blocked {retriever.wait_seconds * 1000:.1f} ms)",
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+"""Optional dense retrieval stage for `Retriever`.
+
+Chunk vectors come from a small sentence-embedding model that runs locally
+on CPU. They are computed at index time, stored as a float32 `.npy` that is
+memory-mapped at query time, and searched through an IVF (inverted file)
+index so a query only touches the vectors in the few closest clusters.
+
+Requires `numpy` and `sentence-transformers`; without them the index is
+built and searched lexically only.
+"""
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+VECTORS_FILE_NAME = "vectors.npy"
+ANN_FILE_NAME = "ann.npz"
+KMEANS_ITERATIONS = 12
+NPROBE = 8
+EMBED_BATCH_SIZE = 64
+
+Encoder = Callable[[Sequence[str]], np.ndarray]
+
+# Per process: the encoder loaded by `shared_encoder`, by `local_only`.
+_ENCODERS: Dict[bool, Optional[Encoder]] = {}
+_ENCODERS_LOCK = threading.Lock()
+
+
+def load_encoder(local_only: bool = True) -> Optional[Encoder]:
+    """Return a CPU encoder for `EMBED_MODEL`, or None if it is unavailable.
+
+    Query-time callers pass `local_only=True` so a missing model is reported
+    as unavailable instead of triggering a download.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    try:
+        model = SentenceTransformer(EMBED_MODEL, device="cpu", local_files_only=local_only)
+    except (OSError, ValueError):
+        return None
+
+    def encode(texts: Sequence[str]) -> np.ndarray:
+        vectors = model.encode(
+            list(texts),
+            batch_size=EMBED_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+    return encode
+
+
+def shared_encoder(local_only: bool = True) -> Optional[Encoder]:
+    """`load_encoder`, loaded once per process and shared by every index and shard."""
+    with _ENCODERS_LOCK:
+        if local_only not in _ENCODERS:
+            _ENCODERS[local_only] = load_encoder(local_only)
+        return _ENCODERS[local_only]
+
+
+def encode_query(query: str) -> Optional[np.ndarray]:
+    """The normalized query vector, or None when no local encoder is available."""
+    encoder = shared_encoder(local_only=True)
+    if encoder is None:
+        return None
+    return _normalize(encoder([query]))[0]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _kmeans(vectors: np.ndarray, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=clusters, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(clusters):
+            members = vectors[assignment == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+def build_dense_index(texts: Sequence[str], index_dir: Path, encoder: Optional[Encoder] = None) -> bool:
+    """Embed `texts` and write vectors plus an IVF index into `index_dir`.
+
+    Returns False (writing nothing) when no encoder is available.
+    """
+    encoder = encoder or shared_encoder(local_only=False)
+    if encoder is None or not texts:
+        return False
+
+    vectors = _normalize(encoder(texts))
+    clusters = max(1, min(len(vectors), int(np.sqrt(len(vectors)))))
+    centroids = _kmeans(vectors, clusters)
+    assignment = np.argmax(vectors @ centroids.T, axis=1)
+    order = np.argsort(assignment, kind="stable").astype(np.int32)
+    offsets = np.searchsorted(assignment[order], np.arange(clusters + 1)).astype(np.int64)
+
+    np.save(index_dir / VECTORS_FILE_NAME, vectors)
+    np.savez(index_dir / ANN_FILE_NAME, centroids=centroids, order=order, offsets=offsets)
+    return True
+
+
+class DenseIndex:
+    def __init__(self, index_dir: Path, encoder: Encoder, nprobe: int = NPROBE) -> None:
+        self._vectors = np.load(index_dir / VECTORS_FILE_NAME, mmap_mode="r")
+        with np.load(index_dir / ANN_FILE_NAME) as ann:
+            self._centroids = ann["centroids"]
+            self._order = ann["order"]
+            self._offsets = ann["offsets"]
+        self._encode = encoder
+        self.nprobe = nprobe
+
+    @classmethod
+    def load(cls, index_dir: Path, encoder: Optional[Encoder] = None) -> Optional["DenseIndex"]:
+        if not (index_dir / VECTORS_FILE_NAME).exists() or not (index_dir / ANN_FILE_NAME).exists():
+            return None
+        encoder = encoder or shared_encoder(local_only=True)
+        if encoder is None:
+            return None
+        return cls(index_dir, encoder)
+
+    def search(
+        self, query: str, top_k: int, query_vector: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Return `(doc_index, cosine_similarity)` pairs, best first.
+
+        Pass `query_vector` (see `encode_query`) when several indexes are
+        searched for the same query, so it is encoded only once.
+        """
+        if query_vector is None:
+            query_vector = _normalize(self._encode([query]))[0]
+        cells = np.argsort(-(self._centroids @ query_vector))[: self.nprobe]
+        candidates = np.concatenate(
+            [self._order[self._offsets[cell]:self._offsets[cell + 1]] for cell in cells]
+        )
+        if not len(candidates):
+            return []
+        candidates.sort()
+        similarities = np.asarray(self._vectors[candidates]) @ query_vector
+        best = np.argsort(-similarities, kind="stable")[:top_k]
+        return [(int(candidates[i]), float(similarities[i])) for i in best]
@@ -6,10 +6,11 @@ MIN_BM25_SCORE = 0.2
 
 
 def is_confident(results: Iterable[RetrievedChunk]) -> bool:
+    """Whether any result matched the query lexically; fused embedding scores do not count."""
     results = list(results)
     if not results:
         return False
-    return results[0].score >= MIN_BM25_SCORE
+    return max(chunk.lexical for chunk in results) >= MIN_BM25_SCORE
 
 
 def unsupported_response() -> str:
@@ -1,6 +1,12 @@
-from dataclasses import dataclass, replace
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from typing import Dict, List, Optional, Tuple
 import copy
+import hashlib
+import json
+import threading
+import time
 
 from app.guardrails import (
     compact_snippet,
@@ -13,6 +19,14 @@ from app.schema import SpecDraft
 
 
 Question = Tuple[str, str, str]
+Turn = Tuple[str, List[dict], str]
+
+TURN_CACHE_SIZE = 1024
+PROMPT_REPO = "dsl-samples"
+PREFETCH_WORKERS = 2
+# Prefetches running or waiting for a worker; further ones are dropped
+# rather than queued behind them.
+PREFETCH_MAX_IN_FLIGHT = 8
 
 QUESTIONS: List[Question] = [
     (
@@ -120,16 +134,26 @@ def _prompt_query(key: str) -> str:
     return "class Blueprint"
 
 
+def prompt_queries() -> List[str]:
+    """The fixed example queries shown with each guide question."""
+    return [_prompt_query(key) for key, _, _ in QUESTIONS]
+
+
 def build_evidence(results, title: str) -> List[dict]:
     evidence = []
     for chunk in results:
-        evidence.append(
-            {
-                "title": title,
-                "file_path": chunk.file_path,
-                "line_range": f"L{chunk.start_line}-L{chunk.end_line}",
-            }
-        )
+        item = {
+            "chunk_id": chunk.chunk_id,
+            "title": title,
+            "file_path": chunk.file_path,
+            "line_range": f"L{chunk.start_line}-L{chunk.end_line}",
+        }
+        if chunk.alternates:
+            item["alternates"] = [
+                f"{alternate['file_path']}:L{alternate['start_line']}-L{alternate['end_line']}"
+                for alternate in chunk.alternates
+            ]
+        evidence.append(item)
     return evidence
 
 
@@ -144,9 +168,83 @@ class GuideState:
     complete: bool
 
 
+class TurnCache:
+    """Bounded LRU of whole guide turns shared across engines.
+
+    A turn is a pure function of the guide state, the (stripped) message and
+    the index version the retriever reads, so that triple is the key; the
+    value is the reply, evidence, step and the state the turn left behind.
+    """
+
+    def __init__(self, max_entries: int = TURN_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Turn, GuideState]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(state: GuideState, message: str, version: Optional[str]) -> str:
+        payload = json.dumps([version, asdict(state), message], sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Turn, GuideState]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, key: str, turn: Turn, state: GuideState) -> None:
+        entry = copy.deepcopy((turn, state))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class PrefetchPool:
+    """Thread pool for speculative prompt searches that drops work instead of queueing it.
+
+    A turn never waits behind other sessions' prefetches: `submit` returns
+    None once PREFETCH_MAX_IN_FLIGHT searches are pending, and the turn
+    then searches inline.
+    """
+
+    def __init__(self, workers: int = PREFETCH_WORKERS, max_in_flight: int = PREFETCH_MAX_IN_FLIGHT) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def submit(self, function, *args, **kwargs) -> Optional[Future]:
+        if not self._slots.acquire(blocking=False):
+            return None
+        future = self._executor.submit(function, *args, **kwargs)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 class GuideEngine:
-    def __init__(self, retriever: Retriever) -> None:
+    def __init__(self, retriever: Retriever, turn_cache: Optional[TurnCache] = None) -> None:
         self.retriever = retriever
+        self.turn_cache = turn_cache
+        # Prompt-example searches started in the background while the user
+        # is reading the previous reply, keyed by query.
+        self._prefetched: Dict[str, Future] = {}
+        # Set when a search in the latest turn hit its budget and returned
+        # partial results.
+        self.partial = False
+        # Searches run by the latest turn (query, hits, scores, timing) and
+        # whether the turn was served from the turn cache; read by the API
+        # request log.
+        self.trace: List[dict] = []
+        self.cached = False
         self.state = GuideState(
             spec=SpecDraft(),
             step_index=0,
@@ -157,32 +255,99 @@ class GuideEngine:
             complete=False,
         )
 
+    def _begin_turn(self) -> None:
+        self.partial = False
+        self.trace = []
+        self.cached = False
+
+    def _note(self, query: str, top_k: int, results, started: float, prefetched: bool = False) -> None:
+        partial = getattr(results, "partial", False)
+        self.partial = self.partial or partial
+        self.trace.append(
+            {
+                "query": query,
+                "top_k": top_k,
+                "repo": PROMPT_REPO,
+                "chunk_ids": [chunk.chunk_id for chunk in results],
+                "scores": [round(chunk.score, 4) for chunk in results],
+                "ms": round((time.perf_counter() - started) * 1000, 3),
+                "prefetched": prefetched,
+                "partial": partial,
+            }
+        )
+
+    def _search(self, query: str, top_k: int):
+        started = time.perf_counter()
+        results = self.retriever.search(query, top_k=top_k, repo=PROMPT_REPO)
+        self._note(query, top_k, results, started)
+        return results
+
     def _current_question(self) -> Question:
         return QUESTIONS[self.state.step_index]
 
-    def _prompt_block(self) -> Tuple[str, List[dict], str]:
+    def prompt_intro(self) -> Tuple[str, str]:
+        """The current question with its lead-in, and its key; runs no search."""
         key, context, question = self._current_question()
         last_answer = (
             self.state.last_answer_by_key.get(QUESTIONS[self.state.step_index - 1][0])
             if self.state.step_index > 0
             else None
         )
-        prompt_examples = self.retriever.search(_prompt_query(key), top_k=1, repo="dsl-samples")
-        prompt_text = "\n".join(
-            [
-                _context_sentence(context, last_answer),
-                question,
-                _format_examples(prompt_examples, "Example (from indexed samples):"),
-            ]
-        )
+        return "\n".join([_context_sentence(context, last_answer), question]), key
+
+    def _prompt_search(self, query: str):
+        future = self._prefetched.get(query)
+        # A prefetch still waiting for a worker is cancelled rather than
+        # waited for; one already running is doing this very search.
+        if future is not None and not future.done() and future.cancel():
+            future = None
+        if future is None or future.cancelled():
+            return self._search(query, top_k=1)
+        started = time.perf_counter()
+        results = future.result()
+        self._note(query, 1, results, started, prefetched=True)
+        return results
+
+    def next_queries(self) -> List[str]:
+        """Answer-independent prompt queries the next turn may run."""
+        if self.state.complete:
+            return []
+        keys = [QUESTIONS[self.state.step_index][0]]
+        if self.state.step_index + 1 < len(QUESTIONS):
+            keys.append(QUESTIONS[self.state.step_index + 1][0])
+        return list(dict.fromkeys(_prompt_query(key) for key in keys))
+
+    def prefetch(self, pool: PrefetchPool) -> None:
+        """Start the next turn's prompt searches on `pool`, dropping any still pending from before."""
+        self._drop_prefetched()
+        for query in self.next_queries():
+            future = pool.submit(self.retriever.search, query, top_k=1, repo=PROMPT_REPO)
+            if future is not None:
+                self._prefetched[query] = future
+
+    def _drop_prefetched(self) -> None:
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched = {}
+
+    def prompt_examples(self, key: str) -> Tuple[str, List[dict]]:
+        """The indexed example shown under question `key`, as text and evidence."""
+        prompt_examples = self._prompt_search(_prompt_query(key))
+        text = _format_examples(prompt_examples, "Example (from indexed samples):")
         evidence = build_evidence(prompt_examples, "Example (from indexed samples)")
-        return prompt_text, evidence, key
+        return text, evidence
+
+    def _prompt_block(self) -> Tuple[str, List[dict], str]:
+        intro, key = self.prompt_intro()
+        examples_text, evidence = self.prompt_examples(key)
+        return "\n".join([intro, examples_text]), evidence, key
 
     def start_prompt(self) -> Tuple[str, List[dict], str]:
+        self._begin_turn()
         return self._prompt_block()
 
     def _after_answer_blocks(self, key: str, answer: str) -> Tuple[str, List[dict]]:
-        examples = self.retriever.search(example_query(key, answer), top_k=3, repo="dsl-samples")
+        examples = self._search(example_query(key, answer), top_k=3)
         text = _format_examples(examples, "Examples (from indexed samples):")
         evidence = build_evidence(examples, "Examples (from indexed samples)")
         return text, evidence
@@ -190,7 +355,28 @@ class GuideEngine:
     def _summary_block(self) -> str:
         return _format_summary(self.state.spec)
 
-    def handle_message(self, message: str) -> Tuple[str, List[dict], str]:
+    def handle_message(self, message: str) -> Turn:
+        message = message.strip()
+        self._begin_turn()
+        try:
+            if self.turn_cache is None:
+                return self._handle_message(message)
+
+            key = TurnCache.key(self.state, message, getattr(self.retriever, "version", None))
+            cached = self.turn_cache.get(key)
+            if cached is not None:
+                turn, self.state = cached
+                self.cached = True
+                return turn
+            turn = self._handle_message(message)
+            # A turn cut short by the search budget may come out better next time.
+            if not self.partial:
+                self.turn_cache.put(key, turn, self.state)
+            return turn
+        finally:
+            self._drop_prefetched()
+
+    def _handle_message(self, message: str) -> Turn:
         if self.state.complete:
             return (
                 "This is a draft you can keep iterating on.",
@@ -198,7 +384,7 @@ class GuideEngine:
                 "complete",
             )
 
-        normalized = message.strip().lower()
+        normalized = message.lower()
         if self.state.awaiting_correction:
             if normalized in {"y", "yes"}:
                 self.state.awaiting_correction = False
@@ -229,7 +415,7 @@ class GuideEngine:
 
         if self.state.turns % 2 == 0 and self.state.step_index < len(QUESTIONS) - 1:
             blocks.append(self._summary_block())
-            prompt_examples = self.retriever.search(_prompt_query(key), top_k=1, repo="dsl-samples")
+            prompt_examples = self._prompt_search(_prompt_query(key))
             blocks.append(_format_examples(prompt_examples, "Example (from indexed samples):"))
             evidence.extend(build_evidence(prompt_examples, "Example (from indexed samples)"))
             blocks.append("Should I change your last answer before we continue?")
@@ -238,9 +424,7 @@ class GuideEngine:
 
         if self.state.step_index >= len(QUESTIONS) - 1:
             blocks.append(self._summary_block())
-            final_examples = self.retriever.search(
-                _prompt_query("target_environment"), top_k=1, repo="dsl-samples"
-            )
+            final_examples = self._prompt_search(_prompt_query("target_environment"))
             blocks.append(_format_examples(final_examples, "Example (from indexed samples):"))
             evidence.extend(build_evidence(final_examples, "Example (from indexed samples)"))
             blocks.append("This is a draft you can keep iterating on.")
@@ -253,16 +437,27 @@ class GuideEngine:
         evidence.extend(prompt_evidence)
         return "\n\n".join(blocks), evidence, next_key
 
+    def rebind(self, retriever: Retriever) -> None:
+        """Search `retriever` from the next turn on, e.g. after an index swap."""
+        if retriever is not self.retriever:
+            self.retriever = retriever
+            self._drop_prefetched()
+
     def clone(self) -> "GuideEngine":
-        cloned = GuideEngine(self.retriever)
+        cloned = GuideEngine(self.retriever, self.turn_cache)
         cloned.state = copy.deepcopy(self.state)
+        cloned._prefetched = dict(self._prefetched)
         return cloned
 
 
 def run_guide(retriever: Retriever) -> SpecDraft:
     engine = GuideEngine(retriever)
-    prompt, _, _ = engine.start_prompt()
-    print(prompt)
+    # Show the question before its example so a retriever that is still
+    # loading does not hold up the first prompt.
+    intro, key = engine.prompt_intro()
+    print(intro, flush=True)
+    examples_text, _ = engine.prompt_examples(key)
+    print(examples_text)
     while not engine.state.complete:
         answer = input("> ").strip()
         reply, _, _ = engine.handle_message(answer)
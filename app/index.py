@@ -1,19 +1,180 @@
+import argparse
 import ast
+import hashlib
 import json
-from dataclasses import dataclass
+import math
+import os
+import re
+import shutil
+import sys
+import time
+import uuid
+import zlib
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.spelling import write_trigram_index
+from app.store import STORE_FILE_NAME, write_chunk_store
+from app.walk import list_repos
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
 INDEX_DIR = PROJECT_ROOT / "index"
-INDEX_FILE = INDEX_DIR / "index.jsonl"
-MANIFEST_FILE = INDEX_DIR / "manifest.json"
+VERSIONS_DIR = INDEX_DIR / "versions"
+CURRENT_FILE = INDEX_DIR / "CURRENT"
+INDEX_FILE_NAME = "index.jsonl"
+MANIFEST_FILE_NAME = "manifest.json"
+POSTINGS_FILE_NAME = "postings.json"
+POSITIONS_FILE_NAME = "positions.jsonl"
+POSITIONS_OFFSETS_FILE_NAME = "positions.offsets.json"
+SYMBOLS_FILE_NAME = "symbols.json"
+# Per version: each corpus' chunk IDs in chunk order, so a chunk can be
+# fetched by ID without loading every corpus to find it.
+CHUNK_IDS_FILE_NAME = "chunk_ids.json"
+CORPORA_DIR_NAME = "corpora"
+SHARDS_DIR_NAME = "shards"
+# Optional corpus list overriding DEFAULT_CORPORA (see `load_corpora`).
+CORPORA_FILE = PROJECT_ROOT / "corpora.json"
+# Older versions are kept around so that readers pinned to them (e.g. an API
+# worker that has not reloaded yet) can keep serving while a rebuild lands.
+KEEP_VERSIONS = 3
+# Readers also hold a lease file per pinned version (`<version>.<pid>.<id>`);
+# leased versions are never pruned, however old.
+LEASES_DIR = INDEX_DIR / "leases"
+CHUNK_ID_LENGTH = 16
+# Chunk attributes not written to index.jsonl: the text is in the chunk store,
+# and symbols/fields are only needed while building symbols.json and postings.
+INDEX_SKIP_FIELDS = {"text", "symbols", "fields"}
 
-PY_EXTENSIONS = {".py"}
-SAMPLE_EXTENSIONS = {".py", ".yaml", ".yml"}
+PY_INCLUDE = ("*.py",)
+SAMPLE_INCLUDE = ("*.py", "*.yaml", "*.yml")
+CHUNKERS = ("auto", "python", "yaml", "text")
+CORPUS_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+WALK_WORKERS = 4
+YAML_EXTENSIONS = {".yaml", ".yml"}
 CHUNK_LINE_SIZE = 300
+PY_CLASS_MAX_LINES = 120
+# Unparseable Python is cut at top-level definitions; smaller pieces are
+# merged with their neighbours up to PY_CLASS_MAX_LINES.
+PY_FALLBACK_MIN_LINES = 30
+YAML_CHUNK_MAX_LINES = 60
+YAML_RESOURCE_KEYS = {
+    "services",
+    "substrates",
+    "profiles",
+    "actions",
+    "packages",
+    "deployments",
+    "credentials",
+    "service_definition_list",
+    "substrate_definition_list",
+    "package_definition_list",
+    "app_profile_list",
+    "deployment_create_list",
+    "action_list",
+    "credential_definition_list",
+}
+TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+# Code tokens keep punctuation as single-character tokens so that patterns
+# like `dependencies =`, `@action` or `Variable.Simple` can be matched exactly.
+CODE_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+|[^\sA-Za-z0-9_]")
+# BM25 parameters (the rank_bm25.BM25Okapi defaults this index replaced).
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_EPSILON = 0.25
+# Terms in at least this share of a corpus' docs (`def`, `self`, `if`,
+# `return` in calm-dsl) have long posting lists but separate documents
+# poorly. `--prune-keep` keeps only their highest-impact postings, and
+# never fewer than PRUNE_MIN_POSTINGS.
+HIGH_DF_RATIO = 0.25
+PRUNE_MIN_POSTINGS = 64
+# Pruning is checked against full scoring on this many queries (logged
+# searches first, then the definition lines of sampled chunks).
+RECALL_QUERIES = 200
+RECALL_TOP_K = 10
+RECALL_QUERY_TOKENS = 8
+# Index statistics recorded in the manifest (see `corpus_stats`).
+STATS_TOP_TERMS = 20
+STATS_LARGEST_CHUNKS = 10
+STATS_PERCENTILES = (50, 90, 99)
+# Near-duplicate detection: chunks are fingerprinted with a one-permutation
+# MinHash over token shingles, bucketed with LSH bands, and candidates whose
+# exact shingle Jaccard similarity reaches the threshold are collapsed.
+SHINGLE_SIZE = 3
+MINHASH_BINS = 64
+LSH_BAND_SIZE = 4
+DUPLICATE_THRESHOLD = 0.85
+DUPLICATE_MIN_TOKENS = 8
+# BM25F field weights. Python chunks are split into these fields during
+# chunking; everything else is a single body field, which scores exactly
+# like plain Okapi BM25.
+FIELD_WEIGHTS = {
+    "definition": 3.0,
+    "bases": 2.0,
+    "decorators": 2.0,
+    "docstring": 1.5,
+    "body": 1.0,
+}
+PY_TOP_LEVEL_RE = re.compile(r"^(?:@|class\s|def\s|async\s+def\s)")
+YAML_KEY_RE = re.compile(r"^\s*(?:-\s+)?([^\s:#][^:#]*?)\s*:(?:\s|$)")
+
+
+@dataclass(frozen=True)
+class Corpus:
+    name: str
+    path: Path
+    include: Tuple[str, ...]
+    # "auto" picks the chunker by file extension; "python", "yaml" or "text"
+    # force one for every file in the corpus.
+    chunker: str = "auto"
+
+
+DEFAULT_CORPORA: Tuple[Corpus, ...] = (
+    Corpus("calm-dsl", DATA_DIR / "calm-dsl", PY_INCLUDE),
+    Corpus("dsl-samples", DATA_DIR / "dsl-samples", SAMPLE_INCLUDE),
+)
+
+
+def load_corpora(config_path: Optional[Path] = None) -> List[Corpus]:
+    """Read the corpus list from `config_path` (default `corpora.json`).
+
+    The file is a JSON list of `{"name", "path", "include", "chunker"}`
+    objects; relative paths are resolved against the project root. Without
+    a config file the built-in `DEFAULT_CORPORA` are used.
+    """
+    config_path = config_path or CORPORA_FILE
+    if not config_path.exists():
+        return list(DEFAULT_CORPORA)
+    with config_path.open("r", encoding="utf-8") as handle:
+        entries = json.load(handle)
+    corpora: List[Corpus] = []
+    for entry in entries:
+        name = entry["name"]
+        chunker = entry.get("chunker", "auto")
+        if not CORPUS_NAME_RE.match(name):
+            raise ValueError(f"Invalid corpus name: {name!r}")
+        if chunker not in CHUNKERS:
+            raise ValueError(f"Unknown chunker for corpus {name!r}: {chunker!r}")
+        path = Path(entry["path"])
+        corpora.append(
+            Corpus(
+                name=name,
+                path=path if path.is_absolute() else PROJECT_ROOT / path,
+                include=tuple(entry.get("include", SAMPLE_INCLUDE)),
+                chunker=chunker,
+            )
+        )
+    if len({corpus.name for corpus in corpora}) != len(corpora):
+        raise ValueError("Corpus names must be unique.")
+    return corpora
+
+
+# (kind, name, line): kind is one of class, base, def, decorator, attribute.
+Symbol = Tuple[str, str, int]
 
 
 @dataclass
@@ -23,129 +184,1203 @@ class Chunk:
     start_line: int
     end_line: int
     text: str
+    symbols: List[str] = field(default_factory=list)
+    # Line ranges of the decorators / definition / docstring fields plus the
+    # bases text, for chunks that start at a class or function definition.
+    fields: Dict[str, object] = field(default_factory=dict)
+    # Near-duplicate chunks collapsed into this one: file_path/start/end only.
+    alternates: List[Dict[str, object]] = field(default_factory=list)
+    # Content-derived, so it survives rebuilds for as long as the chunk
+    # (location and text) does not change.
+    chunk_id: str = ""
 
+    def __post_init__(self) -> None:
+        if not self.chunk_id:
+            self.chunk_id = make_chunk_id(self.repo, self.file_path, self.start_line, self.end_line, self.text)
 
-def _iter_repo_files(repo_path: Path, repo_name: str) -> Iterable[Path]:
-    if repo_name == "dsl-samples":
-        extensions = SAMPLE_EXTENSIONS
-    else:
-        extensions = PY_EXTENSIONS
 
-    for path in repo_path.rglob("*"):
-        if path.is_file() and path.suffix in extensions:
-            yield path
+def make_chunk_id(repo: str, file_path: str, start_line: int, end_line: int, text: str) -> str:
+    key = "\0".join([repo, file_path, str(start_line), str(end_line), text])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:CHUNK_ID_LENGTH]
 
 
 def _read_lines(path: Path) -> List[str]:
     return path.read_text(encoding="utf-8", errors="ignore").splitlines()
 
 
-def _chunk_python_file(path: Path) -> List[Tuple[int, int, str]]:
+def _node_start(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", None) or []
+    return min([node.lineno] + [decorator.lineno for decorator in decorators])
+
+
+def _span(lines: List[str], start: int, end: int) -> List[Tuple[int, int, str]]:
+    text = "\n".join(lines[start - 1:end]).strip()
+    return [(start, end, text)] if text else []
+
+
+def _chunk_python_class(lines: List[str], node: ast.ClassDef) -> List[Tuple[int, int, str]]:
+    start, end = _node_start(node), node.end_lineno
+    if end - start + 1 <= PY_CLASS_MAX_LINES:
+        return _span(lines, start, end)
+
+    # Large classes (typically calm-dsl entity classes) are split into the
+    # class header plus one chunk per method / nested class.
+    members = [
+        child
+        for child in node.body
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    ]
+    if not members:
+        return _chunk_text_lines(lines[start - 1:end], offset=start - 1)
+
+    chunks: List[Tuple[int, int, str]] = []
+    cursor = start
+    for member in members:
+        member_start = _node_start(member)
+        if cursor < member_start:
+            chunks.extend(_span(lines, cursor, member_start - 1))
+        if isinstance(member, ast.ClassDef):
+            chunks.extend(_chunk_python_class(lines, member))
+        else:
+            chunks.extend(_span(lines, member_start, member.end_lineno))
+        cursor = member.end_lineno + 1
+    if cursor <= end:
+        chunks.extend(_span(lines, cursor, end))
+    return chunks
+
+
+def _dotted_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Call):
+        node = node.func
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return ""
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _python_symbols(tree: ast.AST) -> List[Symbol]:
+    symbols: List[Symbol] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            symbols.append(("class", node.name, node.lineno))
+            for base in node.bases:
+                name = _dotted_name(base)
+                if name:
+                    symbols.append(("base", name, node.lineno))
+            for statement in node.body:
+                if isinstance(statement, ast.Assign):
+                    targets = statement.targets
+                elif isinstance(statement, ast.AnnAssign):
+                    targets = [statement.target]
+                else:
+                    continue
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append(("attribute", target.id, statement.lineno))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(("def", node.name, node.lineno))
+        for decorator in getattr(node, "decorator_list", []):
+            name = _dotted_name(decorator)
+            if name:
+                symbols.append(("decorator", name, decorator.lineno))
+    return symbols
+
+
+def _python_fields(node: ast.AST) -> Dict[str, object]:
+    fields: Dict[str, object] = {}
+    if node.decorator_list:
+        fields["decorators"] = [node.decorator_list[0].lineno, node.lineno - 1]
+    fields["definition"] = [node.lineno, max(node.lineno, node.body[0].lineno - 1)]
+    first = node.body[0]
+    if (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+        and first.lineno > node.lineno
+    ):
+        fields["docstring"] = [first.lineno, first.end_lineno]
+    if isinstance(node, ast.ClassDef):
+        bases = " ".join(name for name in map(_dotted_name, node.bases) if name)
+        if bases:
+            fields["bases"] = bases
+    return fields
+
+
+def _chunk_python_file(
+    path: Path,
+) -> Tuple[List[Tuple[int, int, str]], List[Symbol], Dict[int, Dict[str, object]]]:
     lines = _read_lines(path)
     if not lines:
-        return []
+        return [], [], {}
 
     text = "\n".join(lines)
     try:
         tree = ast.parse(text)
     except SyntaxError:
-        return _chunk_text_lines(lines)
+        return _chunk_python_lines(lines), [], {}
+
+    nodes = [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        and getattr(node, "col_offset", 0) == 0
+        and getattr(node, "end_lineno", None)
+    ]
+    nodes.sort(key=_node_start)
 
-    ranges: List[Tuple[int, int]] = []
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-            if getattr(node, "col_offset", 0) == 0:
-                start = getattr(node, "lineno", None)
-                end = getattr(node, "end_lineno", None)
-                if start and end:
-                    ranges.append((start, end))
-
-    ranges.sort()
     chunks: List[Tuple[int, int, str]] = []
     cursor = 1
-    for start, end in ranges:
+    for node in nodes:
+        start = _node_start(node)
         if cursor < start:
-            module_text = "\n".join(lines[cursor - 1:start - 1]).strip()
-            if module_text:
-                chunks.append((cursor, start - 1, module_text))
-        block_text = "\n".join(lines[start - 1:end]).strip()
-        if block_text:
-            chunks.append((start, end, block_text))
-        cursor = end + 1
+            chunks.extend(_span(lines, cursor, start - 1))
+        if isinstance(node, ast.ClassDef):
+            chunks.extend(_chunk_python_class(lines, node))
+        else:
+            chunks.extend(_span(lines, start, node.end_lineno))
+        cursor = node.end_lineno + 1
 
     if cursor <= len(lines):
-        module_text = "\n".join(lines[cursor - 1:]).strip()
-        if module_text:
-            chunks.append((cursor, len(lines), module_text))
+        chunks.extend(_span(lines, cursor, len(lines)))
+
+    fields = {
+        _node_start(node): _python_fields(node)
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    }
+    return chunks, _python_symbols(tree), fields
+
+
+def _chunk_python_lines(lines: List[str]) -> List[Tuple[int, int, str]]:
+    """Fallback for files `ast` cannot parse: cut before top-level definitions."""
+    starts = [
+        number
+        for number, line in enumerate(lines, start=1)
+        if PY_TOP_LEVEL_RE.match(line)
+        and not (number > 1 and lines[number - 2].startswith("@"))
+    ]
+    bounds = sorted(set([1] + starts))
 
+    # Merge runs of short definitions so a file of one-liners does not
+    # become one chunk per function; long definitions stay on their own.
+    merged: List[Tuple[int, int]] = []
+    for index, start in enumerate(bounds):
+        end = bounds[index + 1] - 1 if index + 1 < len(bounds) else len(lines)
+        previous = merged[-1] if merged else None
+        if (
+            previous
+            and min(previous[1] - previous[0], end - start) + 1 < PY_FALLBACK_MIN_LINES
+            and end - previous[0] + 1 <= PY_CLASS_MAX_LINES
+        ):
+            merged[-1] = (previous[0], end)
+        else:
+            merged.append((start, end))
+
+    chunks: List[Tuple[int, int, str]] = []
+    for start, end in merged:
+        chunks.extend(_chunk_text_lines(lines[start - 1:end], offset=start - 1))
     return chunks
 
 
-def _chunk_text_lines(lines: List[str]) -> List[Tuple[int, int, str]]:
+def _chunk_text_lines(
+    lines: List[str], offset: int = 0, size: int = CHUNK_LINE_SIZE
+) -> List[Tuple[int, int, str]]:
     chunks: List[Tuple[int, int, str]] = []
     total = len(lines)
     start = 1
     while start <= total:
-        end = min(start + CHUNK_LINE_SIZE - 1, total)
+        end = min(start + size - 1, total)
         text = "\n".join(lines[start - 1:end]).strip()
         if text:
-            chunks.append((start, end, text))
+            chunks.append((start + offset, end + offset, text))
         start = end + 1
     return chunks
 
 
-def _chunk_file(path: Path) -> List[Tuple[int, int, str]]:
-    if path.suffix == ".py":
+def _yaml_indent(line: str) -> Optional[int]:
+    stripped = line.strip()
+    if not stripped or stripped.startswith("#"):
+        return None
+    return len(line) - len(line.lstrip(" "))
+
+
+def _yaml_key(line: str) -> str:
+    match = YAML_KEY_RE.match(line)
+    return match.group(1).strip("'\"") if match else ""
+
+
+def _yaml_children(lines: List[str], start: int, end: int) -> List[int]:
+    """Line numbers where the direct children of the block at `start` begin."""
+    parent_indent = _yaml_indent(lines[start - 1]) or 0
+    indents = [
+        (number, indent)
+        for number in range(start + 1, end + 1)
+        for indent in [_yaml_indent(lines[number - 1])]
+        if indent is not None
+    ]
+    if not indents:
+        return []
+    child_indent = min(indent for _, indent in indents)
+    if child_indent < parent_indent:
+        return []
+    return [
+        number
+        for number, indent in indents
+        if indent == child_indent
+        and (child_indent > parent_indent or lines[number - 1].lstrip().startswith("-"))
+    ]
+
+
+def _split_yaml_block(
+    lines: List[str], start: int, end: int, resource: bool
+) -> List[Tuple[int, int, bool]]:
+    """Return `(start, end, is_resource_item)` ranges for one YAML block.
+
+    Blocks are kept whole unless they are too long or hold a resource list
+    (services, substrates, profiles, actions, ...), in which case they are cut
+    into their children, recursively.
+    """
+    if not resource and end - start + 1 <= YAML_CHUNK_MAX_LINES:
+        return [(start, end, False)]
+
+    children = _yaml_children(lines, start, end)
+    if not children:
+        return [(start, end, resource)]
+
+    ranges: List[Tuple[int, int, bool]] = []
+    for index, child in enumerate(children):
+        # The header line ("services:") travels with the first child.
+        segment_start = start if index == 0 else child
+        segment_end = children[index + 1] - 1 if index + 1 < len(children) else end
+        child_resource = _yaml_key(lines[child - 1]) in YAML_RESOURCE_KEYS
+        if child_resource or segment_end - child + 1 > YAML_CHUNK_MAX_LINES:
+            nested = _split_yaml_block(lines, child, segment_end, child_resource)
+            nested[0] = (segment_start, nested[0][1], nested[0][2])
+            ranges.extend(nested)
+        else:
+            ranges.append((segment_start, segment_end, resource))
+    return ranges
+
+
+def _chunk_yaml_lines(lines: List[str]) -> List[Tuple[int, int, str]]:
+    """Chunk YAML on top-level keys and resource blocks instead of fixed windows."""
+    tops = [
+        number
+        for number, line in enumerate(lines, start=1)
+        if _yaml_indent(line) == 0 and not line.startswith("-")
+    ]
+    bounds = sorted(set([1] + tops))
+
+    ranges: List[Tuple[int, int, bool]] = []
+    for index, start in enumerate(bounds):
+        end = bounds[index + 1] - 1 if index + 1 < len(bounds) else len(lines)
+        resource = _yaml_key(lines[start - 1]) in YAML_RESOURCE_KEYS
+        ranges.extend(_split_yaml_block(lines, start, end, resource))
+
+    # Merge runs of small plain blocks (name:, description:, ...) so scalar
+    # keys do not each become a one-line chunk; resource items stay separate.
+    merged: List[Tuple[int, int, bool]] = []
+    for start, end, is_resource in ranges:
+        previous = merged[-1] if merged else None
+        if (
+            previous
+            and not is_resource
+            and not previous[2]
+            and end - previous[0] + 1 <= YAML_CHUNK_MAX_LINES
+        ):
+            merged[-1] = (previous[0], end, False)
+        else:
+            merged.append((start, end, is_resource))
+
+    chunks: List[Tuple[int, int, str]] = []
+    for start, end, _ in merged:
+        if end - start + 1 > CHUNK_LINE_SIZE:
+            chunks.extend(_chunk_text_lines(lines[start - 1:end], offset=start - 1))
+            continue
+        chunks.extend(_span(lines, start, end))
+    return chunks
+
+
+def _chunk_file(
+    path: Path,
+    chunker: str = "auto",
+) -> Tuple[List[Tuple[int, int, str]], List[Symbol], Dict[int, Dict[str, object]]]:
+    """Return `(spans, symbols, fields by span start line)` for one file."""
+    if chunker == "auto":
+        if path.suffix == ".py":
+            chunker = "python"
+        elif path.suffix in YAML_EXTENSIONS:
+            chunker = "yaml"
+        else:
+            chunker = "text"
+    if chunker == "python":
         return _chunk_python_file(path)
-    return _chunk_text_lines(_read_lines(path))
+    if chunker == "yaml":
+        return _chunk_yaml_lines(_read_lines(path)), [], {}
+    return _chunk_text_lines(_read_lines(path)), [], {}
 
 
-def build_index() -> List[Chunk]:
-    repos = {
-        "calm-dsl": DATA_DIR / "calm-dsl",
-        "dsl-samples": DATA_DIR / "dsl-samples",
-    }
+def _display_path(path: Path) -> str:
+    try:
+        return str(path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def _assign_symbols(spans: List[Tuple[int, int, str]], symbols: List[Symbol]) -> List[List[str]]:
+    """Attach each symbol to the chunk whose line range contains it."""
+    starts = [start for start, _, _ in spans]
+    assigned: List[List[str]] = [[] for _ in spans]
+    for kind, name, line in symbols:
+        index = bisect_right(starts, line) - 1
+        if index >= 0 and line <= spans[index][1]:
+            key = f"{kind}:{name}"
+            if key not in assigned[index]:
+                assigned[index].append(key)
+    return assigned
+
+
+@contextmanager
+def _timed(timings: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """Add the wall time of the block to `timings[stage]`, if timings are collected."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+def build_index(corpora: Optional[List[Corpus]] = None, timings: Optional[Dict[str, float]] = None) -> List[Chunk]:
+    """Chunk every corpus; each chunk's `repo` is the name of its corpus.
+
+    Stage wall times ("chunk", "dedup") are added to `timings` if given.
+    """
+    corpora = corpora if corpora is not None else load_corpora()
+    chunkers = {corpus.name: corpus.chunker for corpus in corpora}
+    repos = {corpus.name: (corpus.path, corpus.include) for corpus in corpora}
     chunks: List[Chunk] = []
-    for repo_name, repo_path in repos.items():
-        for path in _iter_repo_files(repo_path, repo_name):
-            for start, end, text in _chunk_file(path):
-                rel_path = path.relative_to(PROJECT_ROOT)
-                chunks.append(
-                    Chunk(
-                        repo=repo_name,
-                        file_path=str(rel_path),
-                        start_line=start,
-                        end_line=end,
-                        text=text,
+    with _timed(timings, "chunk"):
+        for repo_name, paths in list_repos(repos, workers=WALK_WORKERS):
+            for path in paths:
+                spans, symbols, fields = _chunk_file(path, chunkers[repo_name])
+                rel_path = _display_path(path)
+                for (start, end, text), chunk_symbols in zip(spans, _assign_symbols(spans, symbols)):
+                    chunks.append(
+                        Chunk(
+                            repo=repo_name,
+                            file_path=rel_path,
+                            start_line=start,
+                            end_line=end,
+                            text=text,
+                            symbols=chunk_symbols,
+                            fields=fields.get(start, {}),
+                        )
                     )
-                )
-    return chunks
+    with _timed(timings, "dedup"):
+        return collapse_near_duplicates(chunks)
+
+
+def _shingles(text: str) -> set:
+    tokens = tokenize(text)
+    if len(tokens) < DUPLICATE_MIN_TOKENS:
+        return set()
+    return {
+        zlib.crc32(" ".join(tokens[index:index + SHINGLE_SIZE]).encode("utf-8"))
+        for index in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def _minhash(shingles: set) -> List[int]:
+    """One-permutation MinHash: one hash per shingle, minimum kept per bin."""
+    bins = [-1] * MINHASH_BINS
+    for value in shingles:
+        slot, rest = value % MINHASH_BINS, value // MINHASH_BINS
+        if bins[slot] < 0 or rest < bins[slot]:
+            bins[slot] = rest
+    return bins
+
+
+def collapse_near_duplicates(chunks: List[Chunk]) -> List[Chunk]:
+    """Keep one representative per cluster of near-identical chunks.
+
+    Clusters never span repos. The first chunk of a cluster is kept and
+    the others are recorded on it as `alternates` (citations only), so
+    they are neither stored nor scored.
+    """
+    shingles = [_shingles(chunk.text) for chunk in chunks]
+    parent = list(range(len(chunks)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    buckets: Dict[Tuple, int] = {}
+    for index, chunk_shingles in enumerate(shingles):
+        if not chunk_shingles:
+            continue
+        signature = _minhash(chunk_shingles)
+        for band in range(0, MINHASH_BINS, LSH_BAND_SIZE):
+            key = (chunks[index].repo, band, tuple(signature[band:band + LSH_BAND_SIZE]))
+            first = buckets.setdefault(key, index)
+            if first == index or find(first) == find(index):
+                continue
+            # Compare against the bucket's first member only; clusters still
+            # form transitively through union-find.
+            other = shingles[first]
+            similarity = len(chunk_shingles & other) / len(chunk_shingles | other)
+            if similarity >= DUPLICATE_THRESHOLD:
+                parent[find(index)] = find(first)
+
+    kept: List[Chunk] = []
+    representative: Dict[int, Chunk] = {}
+    for index, chunk in enumerate(chunks):
+        root = find(index)
+        if root in representative:
+            representative[root].alternates.append(
+                {"file_path": chunk.file_path, "start_line": chunk.start_line, "end_line": chunk.end_line}
+            )
+            continue
+        representative[root] = chunk
+        kept.append(chunk)
+    return kept
+
+
+def build_symbols(chunks: List[Chunk]) -> Dict[str, List[int]]:
+    """Map `kind:name` (lowercased) to the IDs of chunks defining that symbol.
+
+    Dotted bases and decorators are also listed under their last component,
+    so `class X(calm.Service)` is found by `class Service`.
+    """
+    table: Dict[str, List[int]] = {}
+    for doc_id, chunk in enumerate(chunks):
+        for symbol in chunk.symbols:
+            kind, name = symbol.lower().split(":", 1)
+            keys = {f"{kind}:{name}", f"{kind}:{name.rsplit('.', 1)[-1]}"}
+            for key in sorted(keys):
+                docs = table.setdefault(key, [])
+                if not docs or docs[-1] != doc_id:
+                    docs.append(doc_id)
+    return table
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def code_tokenize(text: str) -> List[str]:
+    return CODE_TOKEN_RE.findall(text.lower())
+
+
+def write_positions(chunks: List[Chunk], index_dir: Path) -> None:
+    """Write a positional index over code tokens.
+
+    `positions.jsonl` holds one `[term, docs, positions]` line per term and
+    `positions.offsets.json` maps each term to the byte range of its line, so
+    phrase queries read only the postings of their own terms.
+    """
+    postings: Dict[str, Tuple[List[int], List[List[int]]]] = {}
+    for doc_id, chunk in enumerate(chunks):
+        positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(code_tokenize(chunk.text)):
+            positions.setdefault(token, []).append(position)
+        for token, token_positions in positions.items():
+            docs, doc_positions = postings.setdefault(token, ([], []))
+            docs.append(doc_id)
+            doc_positions.append(token_positions)
+
+    offsets: Dict[str, List[int]] = {}
+    with (index_dir / POSITIONS_FILE_NAME).open("wb") as handle:
+        for term, (docs, doc_positions) in postings.items():
+            line = (json.dumps([term, docs, doc_positions], separators=(",", ":")) + "\n").encode("utf-8")
+            offsets[term] = [handle.tell(), len(line)]
+            handle.write(line)
+        handle.flush()
+        os.fsync(handle.fileno())
+    _write_durable(index_dir / POSITIONS_OFFSETS_FILE_NAME, json.dumps(offsets, separators=(",", ":")))
 
 
-def write_index(chunks: List[Chunk]) -> None:
-    INDEX_DIR.mkdir(parents=True, exist_ok=True)
-    with INDEX_FILE.open("w", encoding="utf-8") as handle:
-        for chunk in chunks:
-            handle.write(json.dumps(chunk.__dict__, ensure_ascii=True) + "\n")
+def _field_tokens(chunk: Chunk) -> Dict[str, List[str]]:
+    """Split a chunk's tokens into BM25F fields.
+
+    Lines covered by the decorators / definition / docstring ranges go to
+    those fields and the remaining lines to `body`; `bases` is an extra
+    field over the base class names.
+    """
+    lines = chunk.text.splitlines()
+    if not chunk.fields or len(lines) != chunk.end_line - chunk.start_line + 1:
+        return {"body": tokenize(chunk.text)}
+
+    owners = ["body"] * len(lines)
+    for name in ("decorators", "definition", "docstring"):
+        if name in chunk.fields:
+            first, last = chunk.fields[name]
+            for line in range(max(first, chunk.start_line), min(last, chunk.end_line) + 1):
+                owners[line - chunk.start_line] = name
+
+    streams: Dict[str, List[str]] = {}
+    for line, owner in zip(lines, owners):
+        streams.setdefault(owner, []).extend(tokenize(line))
+    if "bases" in chunk.fields:
+        streams["bases"] = tokenize(str(chunk.fields["bases"]))
+    return streams
+
+
+def build_postings(chunks: List[Chunk]) -> dict:
+    """Build the BM25F inverted index used by `Retriever`.
+
+    Scoring is precomputed: each posting stores the term's saturated,
+    field-weighted frequency in that doc (its "impact"), so a query adds
+    `idf * impact` per posting regardless of how many fields there are.
+    Each term also stores its IDF and an upper bound on the score it can add
+    to any document, which lets search skip documents that cannot reach the
+    current top-k.
+    """
+    doc_fields: List[Dict[str, Dict[str, int]]] = []
+    field_lengths: Dict[str, List[int]] = {name: [] for name in FIELD_WEIGHTS}
+    doc_lengths: List[Dict[str, int]] = []
+    document_frequency: Dict[str, int] = {}
+    for chunk in chunks:
+        frequencies: Dict[str, Dict[str, int]] = {}
+        lengths: Dict[str, int] = {}
+        seen = set()
+        for name, tokens in _field_tokens(chunk).items():
+            lengths[name] = len(tokens)
+            if tokens:
+                field_lengths[name].append(len(tokens))
+            for token in tokens:
+                per_field = frequencies.setdefault(token, {})
+                per_field[name] = per_field.get(name, 0) + 1
+                if token not in seen:
+                    seen.add(token)
+                    document_frequency[token] = document_frequency.get(token, 0) + 1
+        doc_fields.append(frequencies)
+        doc_lengths.append(lengths)
+
+    doc_count = len(chunks)
+    # Average length over the docs that have the field at all.
+    averages = {
+        name: (sum(values) / len(values) if values else 1.0) for name, values in field_lengths.items()
+    }
+
+    # IDF as BM25Okapi computes it, including the epsilon floor for terms
+    # that occur in more than half of the documents.
+    idfs: Dict[str, float] = {}
+    idf_sum = 0.0
+    negative = []
+    for term, frequency in document_frequency.items():
+        idf = math.log(doc_count - frequency + 0.5) - math.log(frequency + 0.5)
+        idfs[term] = idf
+        idf_sum += idf
+        if idf < 0:
+            negative.append(term)
+    floor = BM25_EPSILON * (idf_sum / len(idfs)) if idfs else 0.0
+    for term in negative:
+        idfs[term] = floor
+
+    postings: Dict[str, Tuple[List[int], List[float]]] = {}
+    for doc_id, frequencies in enumerate(doc_fields):
+        lengths = doc_lengths[doc_id]
+        for term, per_field in frequencies.items():
+            weighted = sum(
+                FIELD_WEIGHTS[name] * tf / (1 - BM25_B + BM25_B * lengths[name] / averages[name])
+                for name, tf in per_field.items()
+            )
+            impact = round(weighted * (BM25_K1 + 1) / (BM25_K1 + weighted), 6)
+            docs, impacts = postings.setdefault(term, ([], []))
+            docs.append(doc_id)
+            impacts.append(impact)
+
+    terms = {}
+    for term, (docs, impacts) in postings.items():
+        terms[term] = {"idf": idfs[term], "ub": idfs[term] * max(impacts), "docs": docs, "impacts": impacts}
+
+    return {
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "field_weights": FIELD_WEIGHTS,
+        "field_averages": averages,
+        "terms": terms,
+    }
+
+
+def document_frequencies(postings: dict) -> Dict[str, int]:
+    return {term: len(entry["docs"]) for term, entry in postings["terms"].items()}
+
+
+def high_df_terms(postings: dict, doc_count: int, ratio: float = HIGH_DF_RATIO) -> List[str]:
+    """Terms occurring in at least `ratio` of the docs, most frequent first."""
+    threshold = max(1, math.ceil(doc_count * ratio))
+    frequent = [term for term, entry in postings["terms"].items() if len(entry["docs"]) >= threshold]
+    return sorted(frequent, key=lambda term: (-len(postings["terms"][term]["docs"]), term))
+
+
+def prune_postings(postings: dict, doc_count: int, keep: float) -> dict:
+    """Keep only the highest-impact `keep` share of each high-DF term's postings.
+
+    Postings are ranked by impact (ties by doc) and the low-impact tail is
+    dropped; the kept postings are stored back in doc order, which WAND and
+    the positional cursors rely on. The term's upper bound is unchanged.
+    """
+    terms = dict(postings["terms"])
+    pruned = 0
+    for term in high_df_terms(postings, doc_count):
+        entry = terms[term]
+        docs, impacts = entry["docs"], entry["impacts"]
+        count = max(PRUNE_MIN_POSTINGS, math.ceil(len(docs) * keep))
+        if count >= len(docs):
+            continue
+        by_impact = sorted(range(len(docs)), key=lambda position: (-impacts[position], docs[position]))
+        kept = sorted(by_impact[:count])
+        terms[term] = dict(entry, docs=[docs[position] for position in kept], impacts=[impacts[position] for position in kept])
+        pruned += 1
+    return dict(postings, terms=terms, pruned={"keep": keep, "terms": pruned})
+
+
+def _top_docs(terms: Dict[str, dict], tokens: List[str], top_k: int) -> List[int]:
+    """Exhaustive BM25F top-k over `terms`, scored as `CorpusIndex` does."""
+    scores: Dict[int, float] = {}
+    for token in tokens:
+        term = terms.get(token)
+        if not term or not term["idf"]:
+            continue
+        idf = term["idf"]
+        for doc, impact in zip(term["docs"], term["impacts"]):
+            scores[doc] = scores.get(doc, 0.0) + idf * impact
+    ranked = sorted((item for item in scores.items() if item[1] > 0), key=lambda item: (-item[1], item[0]))
+    return [doc for doc, _ in ranked[:top_k]]
+
+
+def recall_queries(chunks: List[Chunk], logged: List[str], limit: int = RECALL_QUERIES) -> List[str]:
+    """Queries for the pruning recall check: `logged` ones, topped up from chunk definition lines."""
+    queries = list(dict.fromkeys(logged))[:limit]
+    step = max(1, len(chunks) // max(1, limit - len(queries)))
+    for chunk in chunks[::step]:
+        if len(queries) >= limit:
+            break
+        line = next((line for line in chunk.text.splitlines() if line.strip()), "")
+        query = " ".join(tokenize(line)[:RECALL_QUERY_TOKENS])
+        if query:
+            queries.append(query)
+    return queries
+
+
+def recall_report(full: dict, pruned: dict, queries: List[str], top_k: int = RECALL_TOP_K) -> dict:
+    """Recall@k of pruned postings against full scoring, plus how many postings were dropped."""
+    recalls = []
+    for query in queries:
+        tokens = tokenize(query)
+        expected = _top_docs(full["terms"], tokens, top_k)
+        if expected:
+            found = set(_top_docs(pruned["terms"], tokens, top_k))
+            recalls.append(sum(doc in found for doc in expected) / len(expected))
+    before = sum(len(entry["docs"]) for entry in full["terms"].values())
+    after = sum(len(entry["docs"]) for entry in pruned["terms"].values())
+    return {
+        "keep": pruned["pruned"]["keep"],
+        "terms_pruned": pruned["pruned"]["terms"],
+        "postings_before": before,
+        "postings_after": after,
+        "queries": len(recalls),
+        "top_k": top_k,
+        "recall": round(sum(recalls) / len(recalls), 4) if recalls else 1.0,
+        "min_recall": round(min(recalls), 4) if recalls else 1.0,
+    }
+
+
+def _logged_queries(repo: str) -> List[str]:
+    """Logged searches that targeted `repo` (or every repo), most frequent first."""
+    from app.reqlog import LOG_DIR, REQUEST_LOG_FILE_NAME
+    from app.warmup import frequent_queries
+
+    paths = sorted(LOG_DIR.glob(f"{Path(REQUEST_LOG_FILE_NAME).stem}*{Path(REQUEST_LOG_FILE_NAME).suffix}"))
+    return [query for query, _, query_repo in frequent_queries(paths, RECALL_QUERIES) if query_repo in (None, repo)]
+
+
+def _distribution(values: List[int]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    summary: Dict[str, float] = {"min": ordered[0], "mean": round(sum(ordered) / len(ordered), 1)}
+    for percentile in STATS_PERCENTILES:
+        summary[f"p{percentile}"] = ordered[min(len(ordered) - 1, len(ordered) * percentile // 100)]
+    summary["max"] = ordered[-1]
+    return summary
+
+
+def _postings_memory(postings: dict) -> int:
+    """Estimated bytes the loaded postings take in a Python process.
+
+    Counts the term dict, each term's entry and lists, and one object per
+    posting: a float per impact and an int per doc id past the small-int cache.
+    """
+    terms = postings["terms"]
+    int_bytes, float_bytes = sys.getsizeof(10**6), sys.getsizeof(0.5)
+    total = sys.getsizeof(terms)
+    for term, entry in terms.items():
+        docs, impacts = entry["docs"], entry["impacts"]
+        total += sys.getsizeof(term) + sys.getsizeof(entry) + sys.getsizeof(docs) + sys.getsizeof(impacts)
+        total += int_bytes * sum(1 for doc in docs if doc > 256) + float_bytes * len(impacts)
+    return total
+
+
+def corpus_stats(chunks: List[Chunk], postings: dict) -> dict:
+    """Size and shape of one corpus' index, as recorded in the manifest."""
+    files = {chunk.file_path for chunk in chunks}
+    files.update(alternate["file_path"] for chunk in chunks for alternate in chunk.alternates)
+    sizes = [(len(chunk.text), chunk) for chunk in chunks]
+    by_df = sorted(postings["terms"].items(), key=lambda item: (-len(item[1]["docs"]), item[0]))
+    return {
+        "files": len(files),
+        "chunks": len(chunks),
+        "collapsed_duplicates": sum(len(chunk.alternates) for chunk in chunks),
+        "chunk_lines": _distribution([chunk.end_line - chunk.start_line + 1 for chunk in chunks]),
+        "chunk_chars": _distribution([size for size, _ in sizes]),
+        "vocabulary": len(postings["terms"]),
+        "postings": sum(len(entry["docs"]) for entry in postings["terms"].values()),
+        "postings_memory_bytes": _postings_memory(postings),
+        "top_df_terms": [[term, len(entry["docs"])] for term, entry in by_df[:STATS_TOP_TERMS]],
+        "largest_chunks": [
+            {
+                "file_path": chunk.file_path,
+                "start_line": chunk.start_line,
+                "end_line": chunk.end_line,
+                "chars": size,
+            }
+            for size, chunk in sorted(sizes, key=lambda item: -item[0])[:STATS_LARGEST_CHUNKS]
+        ],
+    }
+
+
+def _disk_usage(directory: Path) -> Dict[str, int]:
+    """Bytes per index file name under `directory`, summed over shards."""
+    usage: Dict[str, int] = {}
+    for path in directory.rglob("*"):
+        if path.is_file():
+            usage[path.name] = usage.get(path.name, 0) + path.stat().st_size
+    return dict(sorted(usage.items()))
+
+
+def new_version_id() -> str:
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+    return f"{stamp}-{uuid.uuid4().hex[:8]}"
+
+
+def version_dir(version: str) -> Path:
+    return VERSIONS_DIR / version
+
+
+def current_version() -> Optional[str]:
+    try:
+        version = CURRENT_FILE.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    if not version or not version_dir(version).is_dir():
+        return None
+    return version
+
+
+def _write_durable(path: Path, text: str) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _set_current(version: str) -> None:
+    tmp_path = INDEX_DIR / f".CURRENT.{version}.tmp"
+    _write_durable(tmp_path, version + "\n")
+    os.replace(tmp_path, CURRENT_FILE)
+
+
+def acquire_lease(version: str) -> Path:
+    """Keep `version` from being pruned until `release_lease` (or this process exits)."""
+    LEASES_DIR.mkdir(parents=True, exist_ok=True)
+    path = LEASES_DIR / f"{version}.{os.getpid()}.{uuid.uuid4().hex[:8]}"
+    path.touch()
+    return path
+
+
+def release_lease(lease: Path) -> None:
+    lease.unlink(missing_ok=True)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def leased_versions() -> set:
+    """Versions with a lease held by a live process; leases of dead processes are removed."""
+    versions = set()
+    if not LEASES_DIR.is_dir():
+        return versions
+    for lease in LEASES_DIR.iterdir():
+        version, _, rest = lease.name.partition(".")
+        pid = rest.split(".", 1)[0]
+        if pid.isdigit() and _process_alive(int(pid)):
+            versions.add(version)
+        else:
+            release_lease(lease)
+    return versions
+
+
+def _prune_versions(keep: int = KEEP_VERSIONS) -> None:
+    current = current_version()
+    leased = leased_versions()
+    versions = sorted(
+        path.name for path in VERSIONS_DIR.iterdir() if path.is_dir() and not path.name.startswith(".")
+    )
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version != current and version not in leased:
+            shutil.rmtree(version_dir(version), ignore_errors=True)
+
+
+def corpus_dir(index_dir: Path, name: str) -> Path:
+    return index_dir / CORPORA_DIR_NAME / name
+
+
+def split_postings(postings: dict, start: int, end: int) -> dict:
+    """The part of `postings` for docs `start <= doc < end`, renumbered from 0.
+
+    IDF, field averages and impacts are kept as computed over the whole
+    corpus, so a shard scores each of its docs exactly as the unsharded
+    index would; only the per-term upper bounds are tightened to the shard.
+    """
+    terms = {}
+    for term, entry in postings["terms"].items():
+        docs = entry["docs"]
+        low, high = bisect_left(docs, start), bisect_left(docs, end)
+        if low == high:
+            continue
+        impacts = entry["impacts"][low:high]
+        terms[term] = {
+            "idf": entry["idf"],
+            "ub": entry["idf"] * max(impacts),
+            "docs": [doc - start for doc in docs[low:high]],
+            "impacts": impacts,
+        }
+    return dict(postings, terms=terms)
+
+
+def _write_corpus(
+    chunks: List[Chunk],
+    target_dir: Path,
+    embed: bool,
+    positional: bool,
+    postings: dict,
+    vocabulary: Dict[str, int],
+    timings: Optional[Dict[str, float]] = None,
+) -> bool:
+    """Write one corpus' index files into `target_dir`; returns whether it was embedded.
+
+    `postings` and `vocabulary` (term -> document frequency, what typos are
+    corrected to) are computed by the caller over the whole corpus, which is
+    how a shard gets corpus-wide statistics.
+    """
+    target_dir.mkdir(parents=True)
+    with _timed(timings, "chunk_store"):
+        # index.jsonl holds chunk metadata only; the text lives in the
+        # compressed chunk store and is read back per result.
+        with (target_dir / INDEX_FILE_NAME).open("w", encoding="utf-8") as handle:
+            for chunk in chunks:
+                metadata = {
+                    key: value for key, value in chunk.__dict__.items() if key not in INDEX_SKIP_FIELDS
+                }
+                handle.write(json.dumps(metadata, ensure_ascii=True) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        write_chunk_store([chunk.text for chunk in chunks], target_dir)
+
+    with _timed(timings, "write_postings"):
+        _write_durable(target_dir / POSTINGS_FILE_NAME, json.dumps(postings, separators=(",", ":")))
+    with _timed(timings, "trigrams"):
+        write_trigram_index(vocabulary, target_dir)
+    if positional:
+        with _timed(timings, "positions"):
+            write_positions(chunks, target_dir)
+    with _timed(timings, "symbols"):
+        _write_durable(target_dir / SYMBOLS_FILE_NAME, json.dumps(build_symbols(chunks), separators=(",", ":")))
+
+    if not embed:
+        return False
+    try:
+        from app.embed import build_dense_index
+    except ImportError:
+        return False
+    with _timed(timings, "embed"):
+        return build_dense_index([chunk.text for chunk in chunks], target_dir)
+
+
+def _write_shards(
+    chunks: List[Chunk],
+    target_dir: Path,
+    embed: bool,
+    positional: bool,
+    postings: dict,
+    vocabulary: Dict[str, int],
+    shards: int,
+    timings: Optional[Dict[str, float]] = None,
+) -> Tuple[List[dict], bool]:
+    """Split one corpus into `shards` contiguous ranges under `target_dir/shards/<i>/`.
+
+    `postings` are the whole corpus' and are split per shard, so every
+    shard carries the global IDF. Returns the shard entries for the
+    manifest and whether every shard was embedded.
+    """
+    size = -(-len(chunks) // shards)
+    entries = []
+    embedded = True
+    for number, start in enumerate(range(0, len(chunks), size)):
+        end = min(start + size, len(chunks))
+        relative = f"{SHARDS_DIR_NAME}/{number}"
+        shard_embedded = _write_corpus(
+            chunks[start:end],
+            target_dir / relative,
+            embed,
+            positional,
+            split_postings(postings, start, end),
+            vocabulary,
+            timings,
+        )
+        embedded = embedded and shard_embedded
+        entries.append({"dir": relative, "offset": start, "chunk_count": end - start})
+    return entries, embedded
+
+
+def write_index(
+    chunks: List[Chunk],
+    embed: bool = False,
+    positional: bool = True,
+    shards: int = 1,
+    prune_keep: Optional[float] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> str:
+    """Write `chunks` as a new index version and make it current.
+
+    Chunks are grouped by corpus (`Chunk.repo`) and every corpus gets its
+    own independent index under `corpora/<name>/`, so readers can load only
+    the corpora they query. With `shards > 1` a corpus is instead split
+    into that many shard indexes (see `_write_shards`). With `prune_keep`
+    the postings of high-DF terms are cut to their highest-impact share (see
+    `prune_postings`) and the recall cost is recorded in the manifest.
+    Per-corpus statistics (`corpus_stats`) and the wall time of each build
+    stage, including any already in `timings` from `build_index`, are
+    recorded too. The version is assembled in a hidden staging
+    directory, renamed into place and only then published by atomically
+    replacing `CURRENT`, so readers never observe a partially written
+    index. Returns the version ID.
+    """
+    timings = dict(timings or {})
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    version = new_version_id()
+    staging_dir = VERSIONS_DIR / f".{version}.tmp"
+    staging_dir.mkdir()
+
+    by_corpus: Dict[str, List[Chunk]] = {}
+    for chunk in chunks:
+        by_corpus.setdefault(chunk.repo, []).append(chunk)
+
+    corpora = []
+    embedded = bool(by_corpus) and embed
+    for name, corpus_chunks in by_corpus.items():
+        entry = {"name": name, "chunk_count": len(corpus_chunks), "dir": f"{CORPORA_DIR_NAME}/{name}"}
+        with _timed(timings, "postings"):
+            postings = build_postings(corpus_chunks)
+        vocabulary = document_frequencies(postings)
+        if prune_keep is not None:
+            with _timed(timings, "prune"):
+                pruned = prune_postings(postings, len(corpus_chunks), prune_keep)
+                queries = recall_queries(corpus_chunks, _logged_queries(name))
+                entry["pruning"] = recall_report(postings, pruned, queries)
+            postings = pruned
+        target_dir = corpus_dir(staging_dir, name)
+        if shards > 1 and len(corpus_chunks) > 1:
+            entry["shards"], corpus_embedded = _write_shards(
+                corpus_chunks, target_dir, embed, positional, postings, vocabulary, shards, timings
+            )
+        else:
+            corpus_embedded = _write_corpus(
+                corpus_chunks, target_dir, embed, positional, postings, vocabulary, timings
+            )
+        embedded = embedded and corpus_embedded
+        entry["embeddings"] = corpus_embedded
+        with _timed(timings, "stats"):
+            entry["stats"] = dict(corpus_stats(corpus_chunks, postings), disk_bytes=_disk_usage(target_dir))
+        corpora.append(entry)
+    chunk_ids = {name: [chunk.chunk_id for chunk in corpus_chunks] for name, corpus_chunks in by_corpus.items()}
+    _write_durable(staging_dir / CHUNK_IDS_FILE_NAME, json.dumps(chunk_ids, separators=(",", ":")))
 
     manifest = {
+        "version": version,
         "created_at": datetime.utcnow().isoformat() + "Z",
         "chunk_count": len(chunks),
-        "index_file": str(INDEX_FILE.relative_to(PROJECT_ROOT)),
+        "corpora": corpora,
+        "chunk_store": STORE_FILE_NAME,
+        "embeddings": embedded,
+        "positional": positional,
+        "shards": shards,
+        "prune_keep": prune_keep,
+        "build_seconds": {stage: round(seconds, 3) for stage, seconds in timings.items()},
     }
-    MANIFEST_FILE.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    _write_durable(staging_dir / MANIFEST_FILE_NAME, json.dumps(manifest, indent=2))
+
+    os.replace(staging_dir, version_dir(version))
+    _set_current(version)
+    _prune_versions()
+    return version
+
+
+def read_manifest(version: str) -> dict:
+    manifest_path = version_dir(version) / MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return {}
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_stats(manifest: dict) -> str:
+    """Human-readable report of the statistics recorded in `manifest`."""
+    lines = [
+        f"Index version {manifest.get('version')} (created {manifest.get('created_at')}), "
+        f"{manifest.get('chunk_count', 0)} chunks"
+    ]
+    timings = manifest.get("build_seconds")
+    if timings:
+        total = sum(timings.values())
+        lines.append(f"Build stages ({total:.2f}s):")
+        for stage, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+            lines.append(f"  {stage:<16} {seconds:8.3f}s")
+    for corpus in manifest.get("corpora", []):
+        stats = corpus.get("stats")
+        lines.append(f"Corpus {corpus['name']}:")
+        if not stats:
+            lines.append("  no statistics recorded; rebuild the index to record them")
+            continue
+        shards = len(corpus.get("shards", [])) or 1
+        lines.append(
+            f"  {stats['files']} files, {stats['chunks']} chunks "
+            f"({stats['collapsed_duplicates']} near-duplicates collapsed), {shards} shard(s)"
+        )
+        for name in ("chunk_lines", "chunk_chars"):
+            distribution = ", ".join(f"{key} {value:g}" for key, value in stats[name].items())
+            lines.append(f"  {name.replace('_', ' ')}: {distribution}")
+        lines.append(
+            f"  vocabulary {stats['vocabulary']} terms, {stats['postings']} postings, "
+            f"~{_format_bytes(stats['postings_memory_bytes'])} in memory"
+        )
+        lines.append("  top DF terms: " + ", ".join(f"{term} ({df})" for term, df in stats["top_df_terms"]))
+        lines.append("  on disk: " + ", ".join(f"{name} {_format_bytes(size)}" for name, size in stats["disk_bytes"].items()))
+        lines.append("  largest chunks:")
+        for chunk in stats["largest_chunks"]:
+            lines.append(f"    {chunk['chars']:>7} chars  {chunk['file_path']}:{chunk['start_line']}-{chunk['end_line']}")
+        if corpus.get("pruning"):
+            report = corpus["pruning"]
+            lines.append(
+                f"  pruned {report['terms_pruned']} high-DF terms at keep={report['keep']}: "
+                f"recall@{report['top_k']} {report['recall']:.3f}"
+            )
+    return "\n".join(lines)
 
 
 def ensure_index() -> None:
-    if not INDEX_FILE.exists():
-        chunks = build_index()
-        write_index(chunks)
+    if current_version() is None:
+        timings: Dict[str, float] = {}
+        chunks = build_index(timings=timings)
+        write_index(chunks, timings=timings)
 
 
 def main() -> None:
-    chunks = build_index()
-    write_index(chunks)
-    print(f"Indexed {len(chunks)} chunks to {INDEX_FILE}")
+    parser = argparse.ArgumentParser(description="Build the Blueprint Buddy index")
+    parser.add_argument(
+        "--embed",
+        action="store_true",
+        help="also compute chunk embeddings for hybrid retrieval (needs sentence-transformers)",
+    )
+    parser.add_argument(
+        "--no-positional",
+        action="store_true",
+        help="skip the positional index used for exact phrase / code-pattern queries",
+    )
+    parser.add_argument(
+        "--corpora",
+        type=Path,
+        help=f"corpus config (JSON); defaults to {CORPORA_FILE.name} if present, else the built-in corpora",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="split each corpus into this many shard indexes for scatter-gather search",
+    )
+    parser.add_argument(
+        "--prune-keep",
+        type=float,
+        metavar="FRACTION",
+        help=(
+            f"keep only this share (by impact) of the postings of terms found in {HIGH_DF_RATIO:.0%}+ of a "
+            "corpus' chunks, and report recall against full scoring"
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the statistics recorded for the current index version and exit",
+    )
+    args = parser.parse_args()
+    if args.stats:
+        version = current_version()
+        if version is None:
+            parser.error("no index has been built yet")
+        print(format_stats(read_manifest(version)))
+        return
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.prune_keep is not None and not 0 < args.prune_keep <= 1:
+        parser.error("--prune-keep must be in (0, 1]")
+
+    timings: Dict[str, float] = {}
+    chunks = build_index(load_corpora(args.corpora), timings)
+    version = write_index(
+        chunks,
+        embed=args.embed,
+        positional=not args.no_positional,
+        shards=args.shards,
+        prune_keep=args.prune_keep,
+        timings=timings,
+    )
+    manifest = read_manifest(version)
+    if args.embed and not manifest["embeddings"]:
+        print("Embedding model unavailable; index will be lexical only.")
+    print(f"Indexed {len(chunks)} chunks to {version_dir(version)}")
+    for corpus in manifest["corpora"]:
+        report = corpus.get("pruning")
+        if report:
+            print(
+                f"{corpus['name']}: pruned {report['terms_pruned']} high-DF terms, postings "
+                f"{report['postings_before']} -> {report['postings_after']}, "
+                f"recall@{report['top_k']} {report['recall']:.3f} (min {report['min_recall']:.3f}) "
+                f"over {report['queries']} queries"
+            )
 
 
 if __name__ == "__main__":
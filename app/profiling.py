@@ -0,0 +1,250 @@
+"""On-demand CPU and memory profiling for the API.
+
+`RequestProfiler` is armed for the next N requests. In `cprofile` mode each
+of those requests runs under `cProfile` and the merged stats are reported
+as text; in `sample` mode a background thread samples the request threads'
+stacks and the result is in collapsed-stack format (`a;b;c count` per line),
+which flamegraph.pl and speedscope read directly. `memory_report` groups
+`tracemalloc` allocations by the first frame inside `app/`.
+"""
+import ast
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+
+APP_DIR = Path(__file__).resolve().parent
+SAMPLE_INTERVAL_SECONDS = 0.002
+PROFILE_MAX_REQUESTS = 1000
+PSTATS_LINES = 60
+TRACEMALLOC_FRAMES = 25
+MEMORY_TOP = 25
+# Where memory is attributed, by the first app frame that allocated it.
+MEMORY_CATEGORIES = {
+    ("retrieve.py", "__init__"): "index",
+    ("retrieve.py", "_load_index"): "index",
+    ("retrieve.py", "_load_postings"): "index",
+    ("retrieve.py", "_load_symbols"): "index",
+    ("retrieve.py", "_load_positions_offsets"): "index",
+    ("retrieve.py", "_dense_index"): "index",
+    ("store.py", "__init__"): "index",
+    ("spelling.py", "__init__"): "index",
+    ("embed.py", "__init__"): "index",
+    ("retrieve.py", "_positions"): "caches",
+    ("retrieve.py", "search"): "caches",
+    ("retrieve.py", "results"): "caches",
+    ("store.py", "_block"): "caches",
+    ("guide.py", "put"): "caches",
+    ("guide.py", "__init__"): "sessions",
+    ("guide.py", "clone"): "sessions",
+    ("guide.py", "_handle_message"): "sessions",
+    ("api.py", "__init__"): "sessions",
+    ("api.py", "create_session"): "sessions",
+}
+
+
+def start_tracemalloc() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.basename(code.co_filename)
+    if module.endswith(".py"):
+        module = module[:-3]
+    return f"{module}:{code.co_name}".replace(";", ",")
+
+
+class RequestProfiler:
+    def __init__(self) -> None:
+        self.mode: Optional[str] = None
+        self.remaining = 0
+        self.profiled = 0
+        self.started_at: Optional[float] = None
+        self._stats: Optional[pstats.Stats] = None
+        self._samples: Counter = Counter()
+        self._threads: Set[int] = set()
+        # Only one cProfile may be enabled at a time (Python 3.12+ raises
+        # otherwise), so concurrent requests are not profiled while one is.
+        self._cprofile_running = False
+        self._sampler: Optional[threading.Thread] = None
+        # Set when a request thread registers (or finishes), so the idle
+        # sampler wakes at once instead of missing the start of a request.
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.remaining > 0
+
+    def arm(self, mode: str, requests: int) -> None:
+        """Profile the next `requests` requests in `mode` ("cprofile" or "sample")."""
+        if mode not in {"cprofile", "sample"}:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        with self._lock:
+            self.mode = mode
+            self.remaining = max(1, min(requests, PROFILE_MAX_REQUESTS))
+            self.profiled = 0
+            self.started_at = time.time()
+            self._stats = None
+            self._samples = Counter()
+        if mode == "sample" and (self._sampler is None or not self._sampler.is_alive()):
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """Wrap one request handler; a no-op unless the profiler is armed.
+
+        In cprofile mode a request that overlaps one being profiled runs
+        unprofiled and does not count against the armed requests.
+        """
+        with self._lock:
+            if self.remaining <= 0 or (self.mode == "cprofile" and self._cprofile_running):
+                mode = None
+            else:
+                self.remaining -= 1
+                mode = self.mode
+                self._cprofile_running = mode == "cprofile"
+        if mode is None:
+            yield
+            return
+
+        ident = threading.get_ident()
+        profile = cProfile.Profile() if mode == "cprofile" else None
+        if profile is not None:
+            profile.enable()
+        else:
+            with self._lock:
+                self._threads.add(ident)
+            self._wake.set()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            with self._lock:
+                self._threads.discard(ident)
+                if profile is not None:
+                    self._cprofile_running = False
+                    if self._stats is None:
+                        self._stats = pstats.Stats(profile)
+                    else:
+                        self._stats.add(profile)
+                self.profiled += 1
+            self._wake.set()
+
+    def _sample_loop(self) -> None:
+        while True:
+            with self._lock:
+                if self.remaining <= 0 and not self._threads:
+                    return
+                threads = set(self._threads)
+            if not threads:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            frames = sys._current_frames()
+            stacks = []
+            for ident in threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    stacks.append(";".join(reversed(stack)))
+            with self._lock:
+                self._samples.update(stacks)
+            time.sleep(SAMPLE_INTERVAL_SECONDS)
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            result: Dict[str, object] = {
+                "mode": self.mode,
+                "profiled_requests": self.profiled,
+                "pending_requests": self.remaining,
+                "started_at": self.started_at,
+            }
+            if self.mode == "cprofile" and self._stats is not None:
+                buffer = io.StringIO()
+                self._stats.stream = buffer
+                self._stats.sort_stats("cumulative").print_stats(PSTATS_LINES)
+                result["format"] = "pstats"
+                result["output"] = buffer.getvalue()
+            elif self.mode == "sample":
+                result["format"] = "collapsed"
+                result["output"] = "\n".join(
+                    f"{stack} {count}" for stack, count in sorted(self._samples.items())
+                )
+        return result
+
+
+def memory_report(top: int = MEMORY_TOP) -> Dict[str, object]:
+    """Current traced memory, grouped by category and by allocating app frame."""
+    if not tracemalloc.is_tracing():
+        return {
+            "tracing": False,
+            "detail": "tracemalloc is off; start the API with BP_TRACEMALLOC=1 to attribute index memory.",
+        }
+
+    snapshot = tracemalloc.take_snapshot()
+    by_site: Counter = Counter()
+    by_category: Counter = Counter()
+    app_prefix = str(APP_DIR) + os.sep
+    for stat in snapshot.statistics("traceback"):
+        site = "(outside app)"
+        category = "other"
+        # Tracebacks are stored oldest call first; the innermost app frame
+        # is the one that asked for the memory.
+        for frame in reversed(stat.traceback):
+            if frame.filename.startswith(app_prefix):
+                name = Path(frame.filename).name
+                function = _function_at(frame.filename, frame.lineno)
+                site = f"{name}:{frame.lineno} {function}"
+                category = MEMORY_CATEGORIES.get((name, function), "other")
+                break
+        by_site[site] += stat.size
+        by_category[category] += stat.size
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": True,
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "categories": dict(by_category.most_common()),
+        "top_sites": [{"site": site, "bytes": size} for site, size in by_site.most_common(top)],
+    }
+
+
+_FUNCTION_CACHE: Dict[str, list] = {}
+
+
+def _function_at(filename: str, lineno: int) -> str:
+    """Name of the innermost `def` enclosing `lineno` in `filename`."""
+    definitions = _FUNCTION_CACHE.get(filename)
+    if definitions is None:
+        try:
+            tree = ast.parse(Path(filename).read_text(encoding="utf-8"))
+        except (OSError, SyntaxError):
+            tree = None
+        definitions = sorted(
+            (node.lineno, node.end_lineno or node.lineno, node.name)
+            for node in (ast.walk(tree) if tree is not None else ())
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        )
+        _FUNCTION_CACHE[filename] = definitions
+    best = "<module>"
+    for start, end, name in definitions:
+        if start <= lineno <= end:
+            best = name
+    return best
@@ -0,0 +1,113 @@
+"""Structured request logging that never blocks a request handler.
+
+Handlers hand records to `RequestLog.log`, which only enqueues them. A
+daemon thread drains the queue in batches and appends them as JSON lines,
+rotating the file by size. When the queue is full the record is dropped and
+counted instead of making the caller wait.
+"""
+import json
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.index import PROJECT_ROOT
+
+LOG_DIR = PROJECT_ROOT / "logs"
+REQUEST_LOG_FILE_NAME = "requests.jsonl"
+LOG_QUEUE_SIZE = 10_000
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_SECONDS = 1.0
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 5
+
+
+class RequestLog:
+    def __init__(
+        self,
+        path: Path = LOG_DIR / REQUEST_LOG_FILE_NAME,
+        max_bytes: int = LOG_MAX_BYTES,
+        backups: int = LOG_BACKUPS,
+        queue_size: int = LOG_QUEUE_SIZE,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self.written = 0
+        # Request threads and the writer thread both count drops.
+        self._count_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="request-log", daemon=True)
+        self._thread.start()
+
+    def log(self, record: dict) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued records and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Records written, dropped (queue full or write failed) and still queued."""
+        with self._count_lock:
+            return {"written": self.written, "dropped": self.dropped, "queued": self._queue.qsize()}
+
+    def rotated_paths(self) -> List[Path]:
+        """The current file followed by its backups, newest first."""
+        return [self.path] + [self._backup(index) for index in range(1, self.backups + 1)]
+
+    def _backup(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{index}{self.path.suffix}")
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            if self._backup(index).exists():
+                os.replace(self._backup(index), self._backup(index + 1))
+        if self.backups > 0:
+            os.replace(self.path, self._backup(1))
+        else:
+            self.path.unlink()
+
+    def _write(self, batch: List[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self._rotate()
+        lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+        with self._count_lock:
+            self.written += len(batch)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=LOG_FLUSH_SECONDS)
+            except queue.Empty:
+                continue
+            batch: List[dict] = []
+            item: Optional[dict] = first
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= LOG_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write(batch)
+                except OSError:
+                    with self._count_lock:
+                        self.dropped += len(batch)
@@ -1,14 +1,83 @@
+import heapq
 import json
+import os
 import re
-from dataclasses import dataclass
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from rank_bm25 import BM25Okapi
+from app.index import (
+    BM25_K1,
+    CHUNK_IDS_FILE_NAME,
+    INDEX_FILE_NAME,
+    POSITIONS_FILE_NAME,
+    POSITIONS_OFFSETS_FILE_NAME,
+    POSTINGS_FILE_NAME,
+    SYMBOLS_FILE_NAME,
+    acquire_lease,
+    code_tokenize,
+    corpus_dir,
+    current_version,
+    make_chunk_id,
+    read_manifest,
+    release_lease,
+    tokenize,
+    version_dir,
+)
+from app.spelling import TrigramIndex
+from app.store import ChunkStore
 
-from app.index import INDEX_FILE
+if TYPE_CHECKING:
+    import numpy as np
 
-TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+# Queries with at least this many distinct terms and postings use WAND
+# dynamic pruning; smaller ones are cheaper to score exhaustively. Both give
+# identical results.
+WAND_MIN_TERMS = 3
+WAND_MIN_POSTINGS = 2000
+# Quoted text is matched as an exact phrase. Short unquoted queries holding
+# code punctuation ("dependencies =", "@action", "Variable.Simple") are too.
+PHRASE_RE = re.compile(r'"([^"]+)"')
+CODE_PATTERN_CHARS = set("@.=()[]{}:")
+PHRASE_MAX_TOKENS = 8
+# Queries that just name a symbol ("class Service", "@action", "def Restart",
+# "provider_type") are answered from the symbol table built at index time.
+SYMBOL_QUERY_RE = re.compile(r"^\s*(class|def|@)?\s*([A-Za-z_][A-Za-z0-9_.]*)\s*$")
+SYMBOL_KINDS = {
+    "class": ("class", "base"),
+    "def": ("def",),
+    "@": ("decorator",),
+    None: ("class", "base", "def", "decorator", "attribute"),
+}
+# Parsed positional postings kept in memory; punctuation terms such as "="
+# have long lists and are reused by most code-pattern queries.
+POSITIONS_CACHE_TERMS = 256
+# Dense (embedding) stage, used only when the index was built with --embed
+# and the embedding model is available locally.
+DENSE_CANDIDATES = 50
+# Both scores are scaled to [0, 1] before fusing (see `_fuse_dense`); this
+# weighs similarity against the lexical score.
+DENSE_WEIGHT = 1.0
+DENSE_MIN_SIMILARITY = 0.35
+# Per-query work budget. Long pasted queries keep only their most selective
+# terms; scoring stops once it has read this many postings or run past the
+# deadline, and the best results so far are returned marked `partial`.
+SEARCH_MAX_TERMS = 24
+SEARCH_MAX_POSTINGS = 250_000
+SEARCH_BUDGET_SECONDS = 0.2
+DEADLINE_CHECK_INTERVAL = 256
+# Complete (non-partial) results of recent searches, per retriever and so
+# per index version.
+RESULT_CACHE_SIZE = 2048
+# Which path answered a search, fastest first. A sharded corpus keeps only
+# the shards answered by the earliest stage, as the unsharded index would.
+STAGE_SYMBOL = 0
+STAGE_PHRASE = 1
+STAGE_SCORED = 2
 
 
 @dataclass
@@ -19,18 +88,95 @@ class RetrievedChunk:
     end_line: int
     text: str
     score: float
+    chunk_id: str = ""
+    # Near-duplicate chunks collapsed into this one at index time.
+    alternates: List[dict] = field(default_factory=list)
+    # The BM25 part of `score`; equal to it unless embeddings were fused in.
+    lexical: float = 0.0
 
 
-class Retriever:
-    def __init__(self, index_path: Path = INDEX_FILE) -> None:
-        self.index_path = index_path
+class SearchResults(list):
+    """Ranked results; `partial` is set when the search budget cut scoring short."""
+
+    def __init__(self, results=(), partial: bool = False) -> None:
+        super().__init__(results)
+        self.partial = partial
+
+
+@dataclass
+class Ranking:
+    """Top documents of one index as (local doc id, score), best first."""
+
+    docs: List[Tuple[int, float]]
+    stage: int
+    partial: bool = False
+    # Raw BM25 scores of `docs` whose ranking score has embeddings fused in.
+    lexical: Dict[int, float] = field(default_factory=dict)
+
+
+class SearchBudget:
+    def __init__(self, seconds: float, max_postings: int = SEARCH_MAX_POSTINGS) -> None:
+        self.deadline = time.perf_counter() + seconds
+        self.postings_left = max_postings
+        self.exhausted = False
+
+    def spend(self, postings: int) -> bool:
+        """Charge `postings` of work; returns False once the budget is gone."""
+        self.postings_left -= postings
+        if self.postings_left < 0 or time.perf_counter() > self.deadline:
+            self.exhausted = True
+        return not self.exhausted
+
+
+class CorpusIndex:
+    """Search over one corpus' index directory."""
+
+    def __init__(self, index_dir: Path, dense: bool = True) -> None:
+        self.index_dir = index_dir
+        self.index_path = self.index_dir / INDEX_FILE_NAME
         self._docs = self._load_index()
-        self._corpus_tokens = [self._tokenize(doc["text"]) for doc in self._docs]
-        self._bm25 = BM25Okapi(self._corpus_tokens)
+        # Versions written before the chunk store keep text inline in _docs.
+        self._store = ChunkStore.load(self.index_dir)
+        self._doc_repos = [doc["repo"] for doc in self._docs]
+        self._chunk_ids = {doc["chunk_id"]: idx for idx, doc in enumerate(self._docs)}
+        self._load_postings()
+        self._symbols = self._load_symbols()
+        self._dense = None
+        self._dense_loaded = not dense
+        self._positions_offsets: Optional[Dict[str, List[int]]] = None
+        self._positions_loaded = False
+        self._positions_file = None
+        self._positions_cache: "OrderedDict[str, Dict[int, List[int]]]" = OrderedDict()
+        # Loaded with the postings so corrections never depend on a later read.
+        self._trigrams = TrigramIndex.load(self.index_dir)
+        self._lazy_lock = threading.Lock()
 
     @staticmethod
     def _tokenize(text: str) -> List[str]:
-        return TOKEN_RE.findall(text.lower())
+        return tokenize(text)
+
+    def _load_postings(self) -> None:
+        with (self.index_dir / POSTINGS_FILE_NAME).open("r", encoding="utf-8") as handle:
+            postings = json.load(handle)
+        self._terms: Dict[str, dict] = postings["terms"]
+
+    def _load_symbols(self) -> Dict[str, List[int]]:
+        symbols_path = self.index_dir / SYMBOLS_FILE_NAME
+        if not symbols_path.exists():
+            return {}
+        with symbols_path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _lookup_symbol(self, query: str, corrections: Dict[str, str]) -> List[int]:
+        match = SYMBOL_QUERY_RE.match(query)
+        if not match or not self._symbols:
+            return []
+        kind, name = match.group(1), match.group(2).lower()
+        name = corrections.get(name, name)
+        docs = set()
+        for symbol_kind in SYMBOL_KINDS[kind]:
+            docs.update(self._symbols.get(f"{symbol_kind}:{name}", ()))
+        return sorted(docs)
 
     def _load_index(self) -> List[dict]:
         docs = []
@@ -39,32 +185,674 @@ class Retriever:
                 line = line.strip()
                 if not line:
                     continue
-                docs.append(json.loads(line))
+                doc = json.loads(line)
+                if "chunk_id" not in doc:
+                    doc["chunk_id"] = make_chunk_id(
+                        doc["repo"], doc["file_path"], doc["start_line"], doc["end_line"], doc["text"]
+                    )
+                docs.append(doc)
         return docs
 
-    def search(self, query: str, top_k: int = 3, repo: Optional[str] = None) -> List[RetrievedChunk]:
-        tokens = self._tokenize(query)
-        if not tokens:
+    def chunk_text(self, idx: int) -> str:
+        """Return the text of chunk `idx`, decompressing its block if needed."""
+        if self._store is None:
+            return self._docs[idx]["text"]
+        return self._store.text(idx)
+
+    def chunk_index(self, chunk_id: str) -> Optional[int]:
+        """Return the position of `chunk_id` in this index version, if present."""
+        return self._chunk_ids.get(chunk_id)
+
+    def _corrections(self, tokens: List[str], budget: SearchBudget) -> Dict[str, str]:
+        """Map query tokens missing from the vocabulary to the terms they were likely typos for.
+
+        At most SEARCH_MAX_TERMS unknown tokens are looked up, in query order,
+        and lookups stop at the deadline; either cut marks the budget exhausted.
+        """
+        unknown = list(dict.fromkeys(token for token in tokens if token not in self._terms))
+        if not unknown:
+            return {}
+        if self._trigrams is None:
+            return {}
+        if len(unknown) > SEARCH_MAX_TERMS:
+            unknown = unknown[:SEARCH_MAX_TERMS]
+            budget.exhausted = True
+        corrections = {}
+        for token in unknown:
+            if not budget.spend(0):
+                break
+            correction = self._trigrams.correct(token)
+            if correction is not None:
+                corrections[token] = correction
+        return corrections
+
+    def _dense_index(self):
+        if not self._dense_loaded:
+            with self._lazy_lock:
+                if not self._dense_loaded:
+                    try:
+                        from app.embed import DenseIndex
+                    except ImportError:
+                        DenseIndex = None
+                    if DenseIndex is not None:
+                        self._dense = DenseIndex.load(self.index_dir)
+                    self._dense_loaded = True
+        return self._dense
+
+    def _dense_scores(self, query: str, query_vector: Optional["np.ndarray"] = None) -> Dict[int, float]:
+        dense = self._dense_index()
+        if dense is None:
+            return {}
+        return {
+            idx: similarity
+            for idx, similarity in dense.search(query, DENSE_CANDIDATES, query_vector)
+            if similarity >= DENSE_MIN_SIMILARITY
+        }
+
+    def _load_positions_offsets(self) -> Optional[Dict[str, List[int]]]:
+        if not self._positions_loaded:
+            with self._lazy_lock:
+                if not self._positions_loaded:
+                    offsets_path = self.index_dir / POSITIONS_OFFSETS_FILE_NAME
+                    if offsets_path.exists():
+                        with offsets_path.open("r", encoding="utf-8") as handle:
+                            self._positions_offsets = json.load(handle)
+                        # One handle for all term reads, opened with the offsets.
+                        self._positions_file = (self.index_dir / POSITIONS_FILE_NAME).open("rb")
+                    self._positions_loaded = True
+        return self._positions_offsets
+
+    def _positions(self, term: str) -> Dict[int, List[int]]:
+        """Positions of `term` per doc, read from its own line of the index."""
+        with self._lazy_lock:
+            cached = self._positions_cache.get(term)
+            if cached is not None:
+                self._positions_cache.move_to_end(term)
+                return cached
+
+        offset, length = self._positions_offsets[term]
+        _, docs, positions = json.loads(os.pread(self._positions_file.fileno(), length, offset))
+        by_doc = dict(zip(docs, positions))
+
+        with self._lazy_lock:
+            self._positions_cache[term] = by_doc
+            while len(self._positions_cache) > POSITIONS_CACHE_TERMS:
+                self._positions_cache.popitem(last=False)
+        return by_doc
+
+    @staticmethod
+    def _phrases(query: str) -> List[List[str]]:
+        quoted = [code_tokenize(phrase) for phrase in PHRASE_RE.findall(query)]
+        if any(quoted):
+            return [phrase for phrase in quoted if phrase]
+        tokens = code_tokenize(query)
+        if len(tokens) <= PHRASE_MAX_TOKENS and any(char in CODE_PATTERN_CHARS for char in query):
+            return [tokens]
+        return []
+
+    def _match_phrases(
+        self, phrases: List[List[str]], repo: Optional[str], budget: SearchBudget
+    ) -> Optional[List[int]]:
+        """Docs containing every phrase, or None if there is no positional index."""
+        offsets = self._load_positions_offsets()
+        if offsets is None:
+            return None
+        terms = {token for phrase in phrases for token in phrase}
+        if len(terms) > SEARCH_MAX_TERMS:
+            budget.exhausted = True
+            return None
+        if any(term not in offsets for term in terms):
             return []
 
-        scores = self._bm25.get_scores(tokens)
-        results: List[RetrievedChunk] = []
-        for idx, score in enumerate(scores):
-            if score <= 0:
+        # Intersect doc sets rarest-first, then check adjacency only there.
+        positions = {term: self._positions(term) for term in terms}
+        rarest = min(terms, key=lambda term: len(positions[term]))
+        candidates = [
+            doc
+            for doc in sorted(positions[rarest])
+            if all(doc in positions[term] for term in terms)
+            and (not repo or self._doc_repos[doc] == repo)
+        ]
+
+        matches = []
+        for count, doc in enumerate(candidates, start=1):
+            if count % DEADLINE_CHECK_INTERVAL == 0 and not budget.spend(DEADLINE_CHECK_INTERVAL):
+                break
+            for phrase in phrases:
+                starts = set(positions[phrase[0]][doc])
+                for offset, token in enumerate(phrase[1:], start=1):
+                    starts &= {position - offset for position in positions[token][doc]}
+                    if not starts:
+                        break
+                if not starts:
+                    break
+            else:
+                matches.append(doc)
+        return matches
+
+    def _score_exhaustive(self, tokens: List[str], repo: Optional[str], budget: SearchBudget) -> Dict[int, float]:
+        """Term-at-a-time BM25F over every posting of every query term.
+
+        If the postings would overrun the budget, terms are taken most
+        selective (highest IDF) first so the cut drops the least useful ones.
+        """
+        total = sum(len(self._terms[token]["docs"]) for token in tokens if token in self._terms)
+        if total > budget.postings_left:
+            tokens = sorted(tokens, key=lambda token: -self._terms[token]["idf"] if token in self._terms else 0.0)
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            term = self._terms.get(token)
+            if not term or not term["idf"]:
                 continue
-            doc = self._docs[idx]
-            if repo and doc["repo"] != repo:
+            if not budget.spend(len(term["docs"])):
+                break
+            idf = term["idf"]
+            for doc, impact in zip(term["docs"], term["impacts"]):
+                scores[doc] = scores.get(doc, 0.0) + idf * impact
+        return {
+            doc: score
+            for doc, score in scores.items()
+            if score > 0 and (not repo or self._doc_repos[doc] == repo)
+        }
+
+    def _score_wand(
+        self, tokens: List[str], top_k: int, repo: Optional[str], budget: SearchBudget
+    ) -> Dict[int, float]:
+        """Document-at-a-time top-k with WAND pruning.
+
+        Cursors are kept ordered by their current document. The pivot is the
+        first document whose summed term upper bounds could beat the current
+        k-th best score; everything before it is skipped without scoring.
+        Ties are broken by lower doc ID, matching the exhaustive path.
+        """
+        weights: Dict[str, int] = {}
+        for token in tokens:
+            term = self._terms.get(token)
+            if term and term["idf"]:
+                weights[token] = weights.get(token, 0) + 1
+
+        # [current doc, position, docs, term, upper bound]
+        cursors = [
+            [self._terms[token]["docs"][0], 0, self._terms[token]["docs"], token, self._terms[token]["ub"] * count]
+            for token, count in weights.items()
+        ]
+        heap: List[Tuple[float, int]] = []
+        steps = 0
+        while cursors:
+            steps += 1
+            if steps % DEADLINE_CHECK_INTERVAL == 0 and not budget.spend(DEADLINE_CHECK_INTERVAL):
+                break
+            cursors.sort(key=lambda cursor: cursor[0])
+            threshold = heap[0][0] if len(heap) >= top_k else None
+            bound = 0.0
+            pivot = None
+            for index, cursor in enumerate(cursors):
+                bound += cursor[4]
+                if threshold is None or bound * (1 + 1e-9) > threshold:
+                    pivot = index
+                    break
+            if pivot is None:
+                break
+
+            pivot_doc = cursors[pivot][0]
+            if cursors[0][0] == pivot_doc:
+                if not repo or self._doc_repos[pivot_doc] == repo:
+                    score = self._score_doc(tokens, pivot_doc, cursors)
+                    if score > 0:
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, (score, -pivot_doc))
+                        elif score > heap[0][0]:
+                            heapq.heapreplace(heap, (score, -pivot_doc))
+                advance_to = pivot_doc + 1
+                moving = [cursor for cursor in cursors if cursor[0] == pivot_doc]
+            else:
+                advance_to = pivot_doc
+                moving = cursors[:pivot]
+
+            for cursor in moving:
+                position = bisect_left(cursor[2], advance_to, cursor[1])
+                cursor[1] = position
+                cursor[0] = cursor[2][position] if position < len(cursor[2]) else None
+            cursors = [cursor for cursor in cursors if cursor[0] is not None]
+
+        return {-neg_doc: score for score, neg_doc in heap}
+
+    def _score_doc(self, tokens: List[str], doc: int, cursors: list) -> float:
+        positions = {cursor[3]: cursor[1] for cursor in cursors if cursor[0] == doc}
+        score = 0.0
+        for token in tokens:
+            position = positions.get(token)
+            if position is None:
+                continue
+            term = self._terms[token]
+            score += term["idf"] * term["impacts"][position]
+        return score
+
+    def _score_one(self, tokens: List[str], doc: int) -> float:
+        score = 0.0
+        for token in tokens:
+            term = self._terms.get(token)
+            if not term or not term["idf"]:
                 continue
+            position = bisect_left(term["docs"], doc)
+            if position < len(term["docs"]) and term["docs"][position] == doc:
+                score += term["idf"] * term["impacts"][position]
+        return score
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 3,
+        repo: Optional[str] = None,
+        exhaustive: bool = False,
+        budget_seconds: float = SEARCH_BUDGET_SECONDS,
+        query_vector: Optional["np.ndarray"] = None,
+    ) -> SearchResults:
+        return self.results(self.rank(query, top_k, repo, exhaustive, budget_seconds, query_vector))
+
+    def rank(
+        self,
+        query: str,
+        top_k: int = 3,
+        repo: Optional[str] = None,
+        exhaustive: bool = False,
+        budget_seconds: float = SEARCH_BUDGET_SECONDS,
+        query_vector: Optional["np.ndarray"] = None,
+    ) -> Ranking:
+        """Top `top_k` docs for `query`; `query_vector` is its embedding, if already encoded."""
+        budget = SearchBudget(budget_seconds)
+        tokens = self._tokenize(query)
+        if not tokens:
+            return Ranking([], STAGE_SCORED)
+
+        # Unknown tokens ("provder_type", "varaible") are corrected to nearby
+        # vocabulary terms instead of matching nothing.
+        corrections = self._corrections(tokens, budget)
+        if corrections:
+            tokens = [corrections.get(token, token) for token in tokens]
+
+        by_idf = sorted(
+            {token for token in tokens if token in self._terms},
+            key=lambda token: (-self._terms[token]["idf"], token),
+        )
+        if len(by_idf) > SEARCH_MAX_TERMS:
+            kept = set(by_idf[:SEARCH_MAX_TERMS])
+            tokens = [token for token in tokens if token in kept]
+            budget.exhausted = True
+
+        # Fast paths first: a dictionary lookup for symbol names, then exact
+        # phrase matching; each only ranks its own (few) matching chunks.
+        symbol_docs = self._lookup_symbol(query, corrections)
+        if symbol_docs:
+            candidates = {
+                doc: score
+                for doc in symbol_docs
+                if not repo or self._doc_repos[doc] == repo
+                for score in [self._score_one(tokens, doc)]
+                if score > 0
+            }
+            if candidates:
+                return self._finish(query, query_vector, tokens, candidates, repo, top_k, STAGE_SYMBOL, budget)
+
+        phrases = self._phrases(query)
+        if phrases:
+            matches = self._match_phrases(phrases, repo, budget)
+            candidates = {
+                doc: score
+                for doc in matches or []
+                for score in [self._score_one(tokens, doc)]
+                if score > 0
+            }
+            if candidates:
+                return self._finish(query, query_vector, tokens, candidates, repo, top_k, STAGE_PHRASE, budget)
+
+        distinct = {token for token in tokens if token in self._terms}
+        # WAND needs non-negative term scores; tiny corpora can have a negative
+        # IDF floor, in which case we score exhaustively.
+        use_wand = (
+            not exhaustive
+            and len(distinct) >= WAND_MIN_TERMS
+            and sum(len(self._terms[token]["docs"]) for token in distinct) >= WAND_MIN_POSTINGS
+            and all(self._terms[token]["idf"] >= 0 for token in distinct)
+        )
+        if use_wand:
+            candidates = self._score_wand(tokens, top_k, repo, budget)
+        else:
+            candidates = self._score_exhaustive(tokens, repo, budget)
+        return self._finish(query, query_vector, tokens, candidates, repo, top_k, STAGE_SCORED, budget)
+
+    def _finish(
+        self,
+        query: str,
+        query_vector: Optional["np.ndarray"],
+        tokens: List[str],
+        candidates: Dict[int, float],
+        repo: Optional[str],
+        top_k: int,
+        stage: int,
+        budget: SearchBudget,
+    ) -> Ranking:
+        """Rank one stage's BM25 `candidates`, fusing in embeddings when the index has them.
+
+        With embeddings every stage is fused, so symbol and phrase hits share
+        the scale of scored hits when corpora are merged by score. Only the
+        scored stage also takes in chunks found by similarity alone.
+        """
+        if self._dense_index() is None:
+            return self._ranking(candidates, top_k, stage, budget)
+        similarities = {
+            idx: similarity
+            for idx, similarity in self._dense_scores(query, query_vector).items()
+            if not repo or self._doc_repos[idx] == repo
+        }
+        lexical = dict(candidates)
+        if stage == STAGE_SCORED:
+            # Hybrid stage: paraphrased queries that share few tokens with the
+            # code still surface through embedding similarity.
+            for idx in similarities:
+                if idx not in lexical:
+                    lexical[idx] = self._score_one(tokens, idx)
+        fused = self._fuse_dense(tokens, lexical, similarities)
+        return self._ranking(fused, top_k, stage, budget, lexical)
+
+    def _fuse_dense(
+        self, tokens: List[str], lexical: Dict[int, float], similarities: Dict[int, float]
+    ) -> Dict[int, float]:
+        """Scale BM25 and cosine similarity to [0, 1] and add them.
+
+        BM25 is divided by the most this query could score (every term's
+        impact saturated at k1 + 1), which depends only on corpus-wide IDF,
+        so shards and repeated queries scale alike. Similarity is rescaled
+        from [DENSE_MIN_SIMILARITY, 1].
+        """
+        ceiling = (BM25_K1 + 1) * sum(abs(self._terms[token]["idf"]) for token in tokens if token in self._terms)
+        ceiling = ceiling or 1.0
+        span = 1.0 - DENSE_MIN_SIMILARITY
+        return {
+            idx: score / ceiling
+            + DENSE_WEIGHT * max(0.0, similarities.get(idx, DENSE_MIN_SIMILARITY) - DENSE_MIN_SIMILARITY) / span
+            for idx, score in lexical.items()
+        }
+
+    @staticmethod
+    def _ranking(
+        candidates: Dict[int, float],
+        top_k: int,
+        stage: int,
+        budget: SearchBudget,
+        lexical: Optional[Dict[int, float]] = None,
+    ) -> Ranking:
+        ranked = sorted(candidates.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        lexical_scores = {doc: lexical[doc] for doc, _ in ranked} if lexical is not None else {}
+        return Ranking(ranked, stage, budget.exhausted, lexical_scores)
+
+    def results(self, ranking: Ranking) -> SearchResults:
+        """Materialize `ranking` as `RetrievedChunk`s, reading each chunk's text."""
+        results = SearchResults(partial=ranking.partial)
+        for idx, score in ranking.docs:
+            doc = self._docs[idx]
             results.append(
                 RetrievedChunk(
                     repo=doc["repo"],
                     file_path=doc["file_path"],
                     start_line=doc["start_line"],
                     end_line=doc["end_line"],
-                    text=doc["text"],
-                    score=float(score),
+                    text=self.chunk_text(idx),
+                    score=score,
+                    chunk_id=doc["chunk_id"],
+                    alternates=doc.get("alternates", []),
+                    lexical=ranking.lexical.get(idx, score),
                 )
             )
+        return results
+
+
+def merge_shards(parts: List[Tuple[int, Ranking, List[RetrievedChunk]]], top_k: int) -> SearchResults:
+    """Merge per-shard results into the ranking the unsharded corpus would give.
+
+    Each part is (shard offset, ranking, its materialized results). Shards
+    carry corpus-wide IDF, so scores are comparable as-is; only shards that
+    answered from the earliest stage count (a symbol hit in any shard means
+    the whole corpus answers from symbols), and ties break by global doc
+    id, matching the single-index order.
+    """
+    partial = any(ranking.partial for _, ranking, _ in parts)
+    answered = [part for part in parts if part[1].docs]
+    if not answered:
+        return SearchResults(partial=partial)
+    stage = min(ranking.stage for _, ranking, _ in answered)
+    merged = [
+        (-score, offset + doc, chunk)
+        for offset, ranking, chunks in answered
+        if ranking.stage == stage
+        for (doc, score), chunk in zip(ranking.docs, chunks)
+    ]
+    merged.sort(key=lambda item: (item[0], item[1]))
+    return SearchResults([chunk for _, _, chunk in merged[:top_k]], partial=partial)
+
+
+class Retriever:
+    """Search over one pinned index version, made of independent corpora.
+
+    Each corpus index is loaded on the first search that targets it, so
+    corpora a caller never queries cost neither startup time nor memory.
+    The version is leased until `close()`, so rebuilds never prune files a
+    lazily loaded corpus still needs.
+    Searching without `repo` queries every corpus and merges by score. A
+    sharded corpus is searched shard by shard in this process; see
+    `app.shards.ShardedRetriever` for searching shards in parallel.
+    """
+
+    def __init__(self, version: Optional[str] = None, dense: bool = True) -> None:
+        # Pin one index version for the lifetime of this retriever; rebuilds
+        # publish new versions without touching the files read here.
+        self.version = version or current_version()
+        if self.version is None:
+            raise FileNotFoundError("No index has been built yet; run `python -m app.index`.")
+        self.index_dir = version_dir(self.version)
+        self._lease = acquire_lease(self.version)
+        if not self.index_dir.is_dir():
+            # Pruned between choosing the version and leasing it.
+            release_lease(self._lease)
+            raise FileNotFoundError(f"Index version {self.version} no longer exists.")
+        self._dense = dense
+        manifest = read_manifest(self.version)
+        # Versions written before per-corpus indexes hold a single index that
+        # mixes all repos; it is kept under the name "" and filtered by repo.
+        # Each corpus maps to its shards as (index dir, offset of the shard's
+        # first chunk in the corpus); an unsharded corpus is one shard at 0.
+        self._corpus_dirs: Dict[str, List[Tuple[Path, int]]] = {
+            corpus["name"]: [
+                (corpus_dir(self.index_dir, corpus["name"]) / shard["dir"], shard["offset"])
+                for shard in corpus.get("shards", [{"dir": ".", "offset": 0}])
+            ]
+            for corpus in manifest.get("corpora", [])
+        } or {"": [(self.index_dir, 0)]}
+        self._embedded: Dict[str, bool] = {
+            corpus["name"]: bool(corpus.get("embeddings")) for corpus in manifest.get("corpora", [])
+        } or {"": bool(manifest.get("embeddings"))}
+        # chunk ID -> (corpus, position in the corpus), read on the first lookup.
+        self._chunk_locations: Optional[Dict[str, Tuple[str, int]]] = None
+        self._chunk_locations_loaded = False
+        self._corpora: Dict[str, List[CorpusIndex]] = {}
+        self._result_cache: "OrderedDict[tuple, SearchResults]" = OrderedDict()
+        self._lazy_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def corpora(self) -> List[str]:
+        return [name for name in self._corpus_dirs if name]
+
+    @property
+    def loaded_corpora(self) -> Dict[str, List[CorpusIndex]]:
+        return dict(self._corpora)
+
+    def corpus(self, name: str) -> List[CorpusIndex]:
+        """The shard indexes of corpus `name` (one unless it was built sharded)."""
+        shards = self._corpora.get(name)
+        if shards is None:
+            with self._load_lock:
+                shards = self._corpora.get(name)
+                if shards is None:
+                    shards = [CorpusIndex(path, dense=self._dense) for path, _ in self._corpus_dirs[name]]
+                    self._corpora[name] = shards
+        return shards
+
+    def _targets(self, repo: Optional[str]) -> List[str]:
+        if "" in self._corpus_dirs:
+            return [""]
+        if repo is None:
+            return list(self._corpus_dirs)
+        return [repo] if repo in self._corpus_dirs else []
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 3,
+        repo: Optional[str] = None,
+        exhaustive: bool = False,
+        budget_seconds: float = SEARCH_BUDGET_SECONDS,
+    ) -> SearchResults:
+        key = (query, top_k, repo, exhaustive)
+        with self._lazy_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+                return SearchResults(cached)
+
+        results = self._search(query, top_k, repo, exhaustive, budget_seconds)
+        if not results.partial:
+            with self._lazy_lock:
+                self._result_cache[key] = results
+                while len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            results = SearchResults(results)
+        return results
+
+    def _search(
+        self,
+        query: str,
+        top_k: int,
+        repo: Optional[str],
+        exhaustive: bool,
+        budget_seconds: float,
+    ) -> SearchResults:
+        targets = self._targets(repo)
+        query_vector = self._query_vector(query, targets)
+        if len(targets) == 1:
+            return self._search_corpus(targets[0], query, top_k, repo, exhaustive, budget_seconds, query_vector)
+
+        # The corpora share one deadline; results merge by score, ties keeping
+        # corpus order and then each corpus' own ranking.
+        deadline = time.perf_counter() + budget_seconds
+        merged: List[RetrievedChunk] = []
+        partial = False
+        for name in targets:
+            remaining = max(0.0, deadline - time.perf_counter())
+            results = self._search_corpus(name, query, top_k, None, exhaustive, remaining, query_vector)
+            partial = partial or results.partial
+            merged.extend(results)
+        merged.sort(key=lambda chunk: -chunk.score)
+        return SearchResults(merged[:top_k], partial=partial)
+
+    def _query_vector(self, query: str, names: List[str]) -> Optional["np.ndarray"]:
+        """The query's embedding, encoded once for all corpora searched, or None without one."""
+        if not self._dense or not any(self._embedded.get(name) for name in names):
+            return None
+        try:
+            from app.embed import encode_query
+        except ImportError:
+            return None
+        return encode_query(query)
+
+    def _search_corpus(
+        self,
+        name: str,
+        query: str,
+        top_k: int,
+        repo: Optional[str],
+        exhaustive: bool,
+        budget_seconds: float,
+        query_vector: Optional["np.ndarray"] = None,
+    ) -> SearchResults:
+        shards = self.corpus(name)
+        if len(shards) == 1:
+            return shards[0].search(query, top_k, repo, exhaustive, budget_seconds, query_vector)
+        deadline = time.perf_counter() + budget_seconds
+        parts = []
+        for index, (_, offset) in zip(shards, self._corpus_dirs[name]):
+            remaining = max(0.0, deadline - time.perf_counter())
+            ranking = index.rank(query, top_k, repo, exhaustive, remaining, query_vector)
+            parts.append((offset, ranking, index.results(ranking)))
+        return merge_shards(parts, top_k)
+
+    def _chunk_table(self) -> Optional[Dict[str, Tuple[str, int]]]:
+        """chunk ID -> (corpus, position in it), or None for versions written without the table."""
+        if not self._chunk_locations_loaded:
+            with self._load_lock:
+                if not self._chunk_locations_loaded:
+                    path = self.index_dir / CHUNK_IDS_FILE_NAME
+                    if path.exists():
+                        with path.open("r", encoding="utf-8") as handle:
+                            table = json.load(handle)
+                        self._chunk_locations = {
+                            chunk_id: (name, position)
+                            for name, chunk_ids in table.items()
+                            for position, chunk_id in enumerate(chunk_ids)
+                        }
+                    self._chunk_locations_loaded = True
+        return self._chunk_locations
+
+    def get_chunk(self, chunk_id: str) -> Optional[dict]:
+        """Metadata and text of `chunk_id`.
+
+        The version's chunk ID table names the corpus and shard to load, so
+        an unknown ID loads nothing. Versions without the table look in
+        loaded corpora first, then load the others.
+        """
+        table = self._chunk_table()
+        if table is None:
+            names = list(self._corpora) + [name for name in self._corpus_dirs if name not in self._corpora]
+            for name in names:
+                doc = self._corpus_chunk(name, chunk_id)
+                if doc is not None:
+                    return doc
+            return None
+        location = table.get(chunk_id)
+        if location is None:
+            return None
+        name, position = location
+        offsets = [offset for _, offset in self._corpus_dirs[name]]
+        return self._corpus_chunk(name, chunk_id, bisect_right(offsets, position) - 1)
+
+    def _corpus_chunk(self, name: str, chunk_id: str, shard: Optional[int] = None) -> Optional[dict]:
+        """`chunk_id` in corpus `name`, looking only in `shard` when it is known."""
+        indexes = self.corpus(name)
+        for index in indexes if shard is None else [indexes[shard]]:
+            idx = index.chunk_index(chunk_id)
+            if idx is not None:
+                return dict(index._docs[idx], text=index.chunk_text(idx))
+        return None
+
+    def find_chunk_text(self, file_path: str, start_line: int, end_line: int) -> Optional[str]:
+        """Text of the chunk at this location; only corpora already searched are scanned."""
+        for index in [index for shards in self._corpora.values() for index in shards]:
+            for idx, doc in enumerate(index._docs):
+                if doc["file_path"] == file_path and doc["start_line"] == start_line and doc["end_line"] == end_line:
+                    return index.chunk_text(idx)
+        return None
+
+    def close(self) -> None:
+        """Release the version lease; the retriever must not be used afterwards."""
+        release_lease(self._lease)
 
-        results.sort(key=lambda item: item.score, reverse=True)
-        return results[:top_k]
+    def cache_stats(self) -> Dict[str, int]:
+        corpora = [index for shards in self._corpora.values() for index in shards]
+        return {
+            "corpora_loaded": len(self._corpora),
+            "shards_loaded": len(corpora),
+            "index_chunks": sum(len(index._docs) for index in corpora),
+            "index_terms": sum(len(index._terms) for index in corpora),
+            "result_cache_entries": len(self._result_cache),
+            "positions_cache_terms": sum(len(index._positions_cache) for index in corpora),
+        }
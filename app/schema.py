@@ -1,8 +1,9 @@
 import json
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -38,11 +39,17 @@ class SpecDraft:
         return "\n".join(lines)
 
 
-def export_spec(spec: SpecDraft, output_dir: Path) -> tuple[Path, Path]:
+def export_spec(spec: SpecDraft, output_dir: Path, name: Optional[str] = None) -> tuple[Path, Path]:
+    """Write `spec` as JSON and Markdown into `output_dir`.
+
+    Without a `name`, files are named by timestamp plus a random suffix so
+    concurrent exports never overwrite each other.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    json_path = output_dir / f"spec_{timestamp}.json"
-    md_path = output_dir / f"spec_{timestamp}.md"
+    if name is None:
+        name = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:8]}"
+    json_path = output_dir / f"spec_{name}.json"
+    md_path = output_dir / f"spec_{name}.md"
 
     json_path.write_text(json.dumps(spec.to_dict(), indent=2), encoding="utf-8")
     md_path.write_text(spec.to_markdown(), encoding="utf-8")
@@ -0,0 +1,236 @@
+"""Scatter-gather search over sharded corpora in worker processes.
+
+An index built with `python -m app.index --shards N` splits each corpus into
+N shard indexes that share the corpus-wide IDF. `ShardedRetriever` gives
+every shard its own single-process pool, so each worker loads exactly one
+shard, sends a query to all shards of a corpus at once and merges their
+top-k with `merge_shards`. Results are the same `RetrievedChunk`s, in the
+same order, as an unsharded `Retriever` over the same chunks.
+"""
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from app.retrieve import (
+    CorpusIndex,
+    Ranking,
+    RetrievedChunk,
+    Retriever,
+    SearchResults,
+    merge_shards,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Workers are spawned rather than forked: the API forks from a process that
+# already runs threads (request log, prefetch, index watcher).
+SHARD_START_METHOD = "spawn"
+# Time allowed for IPC on top of the search budget before a shard is skipped.
+SHARD_RESULT_GRACE_SECONDS = 1.0
+
+# Per worker process: the shard index it serves, loaded on first use.
+_SHARD_INDEXES: Dict[str, CorpusIndex] = {}
+
+
+def _shard_index(shard_dir: str, dense: bool) -> CorpusIndex:
+    index = _SHARD_INDEXES.get(shard_dir)
+    if index is None:
+        index = CorpusIndex(Path(shard_dir), dense=dense)
+        _SHARD_INDEXES[shard_dir] = index
+    return index
+
+
+def _search_shard(
+    shard_dir: str,
+    dense: bool,
+    query: str,
+    top_k: int,
+    repo: Optional[str],
+    exhaustive: bool,
+    budget_seconds: float,
+    query_vector: Optional["np.ndarray"] = None,
+) -> Tuple[Ranking, List[RetrievedChunk]]:
+    index = _shard_index(shard_dir, dense)
+    ranking = index.rank(query, top_k, repo, exhaustive, budget_seconds, query_vector)
+    return ranking, list(index.results(ranking))
+
+
+def _load_shard(shard_dir: str, dense: bool) -> int:
+    return len(_shard_index(shard_dir, dense)._docs)
+
+
+def _shard_chunk(shard_dir: str, dense: bool, chunk_id: str) -> Optional[dict]:
+    index = _shard_index(shard_dir, dense)
+    idx = index.chunk_index(chunk_id)
+    return dict(index._docs[idx], text=index.chunk_text(idx)) if idx is not None else None
+
+
+def _shard_find(shard_dir: str, dense: bool, file_path: str, start_line: int, end_line: int) -> Optional[str]:
+    index = _shard_index(shard_dir, dense)
+    for idx, doc in enumerate(index._docs):
+        if doc["file_path"] == file_path and doc["start_line"] == start_line and doc["end_line"] == end_line:
+            return index.chunk_text(idx)
+    return None
+
+
+class ShardedRetriever(Retriever):
+    """`Retriever` that searches each shard of a sharded corpus in its own process.
+
+    Shard workers start on `start()`, or else on the first search that
+    targets their corpus; either way a search's deadline only begins once
+    its shards are loaded. Unsharded corpora (and pre-sharding versions) are searched in-process
+    exactly as `Retriever` does. Worker processes only exit on `close()`;
+    the API closes a swapped-out retriever once no session is bound to it.
+    A worker that dies is replaced and its call retried once.
+    """
+
+    def __init__(self, version: Optional[str] = None, dense: bool = True) -> None:
+        super().__init__(version, dense)
+        self._pools: Dict[Path, ProcessPoolExecutor] = {}
+        # Shards whose worker has loaded its index.
+        self._started: Set[Path] = set()
+        self._context = multiprocessing.get_context(SHARD_START_METHOD)
+
+    def _pool(self, shard_dir: Path) -> ProcessPoolExecutor:
+        pool = self._pools.get(shard_dir)
+        if pool is None:
+            with self._load_lock:
+                pool = self._pools.get(shard_dir)
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=1, mp_context=self._context)
+                    self._pools[shard_dir] = pool
+        return pool
+
+    def _drop_pool(self, shard_dir: Path, pool: ProcessPoolExecutor) -> None:
+        with self._load_lock:
+            if self._pools.get(shard_dir) is pool:
+                del self._pools[shard_dir]
+                self._started.discard(shard_dir)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _sharded(self, name: str) -> bool:
+        return len(self._corpus_dirs[name]) > 1
+
+    def _submit(self, shard_dir: Path, function, *args) -> Future:
+        pool = self._pool(shard_dir)
+        try:
+            return pool.submit(function, str(shard_dir), self._dense, *args)
+        except BrokenProcessPool:
+            # The worker died since the last call: start a fresh one.
+            self._drop_pool(shard_dir, pool)
+            return self._pool(shard_dir).submit(function, str(shard_dir), self._dense, *args)
+
+    def _scatter(self, name: str, function, *args) -> List[Tuple[Path, int, Future]]:
+        return [(path, offset, self._submit(path, function, *args)) for path, offset in self._corpus_dirs[name]]
+
+    def _result(self, shard_dir: Path, future: Future, function, args: tuple, deadline: Optional[float] = None):
+        """Result of a shard call; a broken worker pool is rebuilt and the call retried once.
+
+        Raises `BrokenProcessPool` if the retry breaks too, `FutureTimeoutError`
+        past `deadline`, and wraps anything the worker raised in a `RuntimeError`.
+        """
+        for attempt in range(2):
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                return future.result(timeout=timeout)
+            except BrokenProcessPool:
+                pool = self._pools.get(shard_dir)
+                if pool is not None:
+                    self._drop_pool(shard_dir, pool)
+                if attempt:
+                    raise
+                future = self._submit(shard_dir, function, *args)
+            except FutureTimeoutError:
+                raise
+            except Exception as exc:
+                raise RuntimeError(f"Shard {shard_dir} failed: {exc!r}") from exc
+
+    def start(self, names: Optional[List[str]] = None) -> None:
+        """Start the workers of the sharded corpora in `names` (default: all) and load their shards.
+
+        Blocks until every shard is loaded, so spawning workers and reading
+        indexes never eats into a search's deadline.
+        """
+        for name in list(self._corpus_dirs) if names is None else names:
+            if not self._sharded(name):
+                continue
+            cold = [path for path, _ in self._corpus_dirs[name] if path not in self._started]
+            futures = [(path, self._submit(path, _load_shard)) for path in cold]
+            for path, future in futures:
+                self._result(path, future, _load_shard, ())
+                self._started.add(path)
+
+    def _search_corpus(
+        self,
+        name: str,
+        query: str,
+        top_k: int,
+        repo: Optional[str],
+        exhaustive: bool,
+        budget_seconds: float,
+        query_vector: Optional["np.ndarray"] = None,
+    ) -> SearchResults:
+        if not self._sharded(name):
+            return super()._search_corpus(name, query, top_k, repo, exhaustive, budget_seconds, query_vector)
+
+        self.start([name])
+        # Every shard gets the full budget since they run side by side. The
+        # query is encoded here once rather than in every worker.
+        args = (query, top_k, repo, exhaustive, budget_seconds, query_vector)
+        futures = self._scatter(name, _search_shard, *args)
+        deadline = time.perf_counter() + budget_seconds + SHARD_RESULT_GRACE_SECONDS
+        parts = []
+        missing = False
+        for path, offset, future in futures:
+            try:
+                ranking, chunks = self._result(path, future, _search_shard, args, deadline)
+            except (FutureTimeoutError, BrokenProcessPool):
+                # Slow or crashed shard: merge the others and flag the result partial.
+                missing = True
+                continue
+            parts.append((offset, ranking, chunks))
+        results = merge_shards(parts, top_k)
+        results.partial = results.partial or missing
+        return results
+
+    def _corpus_chunk(self, name: str, chunk_id: str, shard: Optional[int] = None) -> Optional[dict]:
+        if not self._sharded(name):
+            return super()._corpus_chunk(name, chunk_id, shard)
+        if shard is not None:
+            # Known shard: only its worker is asked (and started).
+            path = self._corpus_dirs[name][shard][0]
+            future = self._submit(path, _shard_chunk, chunk_id)
+            return self._result(path, future, _shard_chunk, (chunk_id,))
+        for path, _, future in self._scatter(name, _shard_chunk, chunk_id):
+            doc = self._result(path, future, _shard_chunk, (chunk_id,))
+            if doc is not None:
+                return doc
+        return None
+
+    def find_chunk_text(self, file_path: str, start_line: int, end_line: int) -> Optional[str]:
+        """Text of the chunk at this location; only shards whose workers have started are scanned."""
+        for name in self._corpus_dirs:
+            paths = [path for path, _ in self._corpus_dirs[name]]
+            if not self._sharded(name) or not all(path in self._pools for path in paths):
+                continue
+            args = (file_path, start_line, end_line)
+            for path, _, future in self._scatter(name, _shard_find, *args):
+                text = self._result(path, future, _shard_find, args)
+                if text is not None:
+                    return text
+        return super().find_chunk_text(file_path, start_line, end_line)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return dict(super().cache_stats(), shard_workers=len(self._pools))
+
+    def close(self) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+        self._started.clear()
+        super().close()
@@ -0,0 +1,112 @@
+"""Typo correction for query terms against the indexed vocabulary.
+
+At index time every term of a corpus is broken into character trigrams
+(padded with `$`, so "var" yields `$va`, `var`, `ar$`) and a trigram ->
+terms table is written next to the postings. At query time an unknown
+term looks up its own trigrams, keeps the vocabulary terms sharing the
+most of them and corrects to the closest by edit distance (counting a
+transposition as one edit), preferring the more frequent term on ties.
+"""
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRIGRAMS_FILE_NAME = "trigrams.json"
+# Shorter tokens have too many one-edit neighbours to correct reliably.
+TYPO_MIN_LENGTH = 4
+# Edits allowed: one below this length, two from it on.
+TYPO_TWO_EDITS_LENGTH = 8
+# Vocabulary terms (by shared trigrams) checked with the edit distance.
+TYPO_CANDIDATES = 24
+TYPO_CACHE_SIZE = 4096
+
+
+def trigrams(term: str) -> List[str]:
+    padded = f"${term}$"
+    return sorted({padded[index:index + 3] for index in range(len(padded) - 2)})
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal string alignment distance, or `limit + 1` once it exceeds `limit`."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous: List[int] = []
+    current = list(range(len(right) + 1))
+    for i in range(1, len(left) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(right)
+        for j in range(1, len(right) + 1):
+            cost = 0 if left[i - 1] == right[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and left[i - 1] == right[j - 2] and left[i - 2] == right[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def write_trigram_index(document_frequency: Dict[str, int], index_dir: Path) -> None:
+    """Write the vocabulary, its document frequencies and the trigram table into `index_dir`."""
+    terms = sorted(document_frequency)
+    grams: Dict[str, List[int]] = {}
+    for term_id, term in enumerate(terms):
+        # Anything shorter is never within one edit of a correctable token.
+        if len(term) >= TYPO_MIN_LENGTH - 1:
+            for gram in trigrams(term):
+                grams.setdefault(gram, []).append(term_id)
+    table = {"terms": terms, "df": [document_frequency[term] for term in terms], "grams": grams}
+    with (index_dir / TRIGRAMS_FILE_NAME).open("w", encoding="utf-8") as handle:
+        handle.write(json.dumps(table, separators=(",", ":")))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+class TrigramIndex:
+    def __init__(self, index_dir: Path, cache_size: int = TYPO_CACHE_SIZE) -> None:
+        with (index_dir / TRIGRAMS_FILE_NAME).open("r", encoding="utf-8") as handle:
+            table = json.load(handle)
+        self._terms: List[str] = table["terms"]
+        self._df: List[int] = table["df"]
+        self._grams: Dict[str, List[int]] = table["grams"]
+        self.vocabulary = set(self._terms)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Optional["TrigramIndex"]:
+        if not (index_dir / TRIGRAMS_FILE_NAME).exists():
+            return None
+        return cls(index_dir)
+
+    def correct(self, token: str) -> Optional[str]:
+        """The vocabulary term `token` was most likely a typo for, or None."""
+        if token in self.vocabulary or len(token) < TYPO_MIN_LENGTH or token.isdigit():
+            return None
+        with self._lock:
+            if token in self._cache:
+                self._cache.move_to_end(token)
+                return self._cache[token]
+
+        limit = 1 if len(token) < TYPO_TWO_EDITS_LENGTH else 2
+        shared: Counter = Counter()
+        for gram in trigrams(token):
+            shared.update(self._grams.get(gram, ()))
+        best = None
+        for term_id, _ in shared.most_common(TYPO_CANDIDATES):
+            term = self._terms[term_id]
+            distance = edit_distance(token, term, limit)
+            if distance > limit:
+                continue
+            key = (distance, -self._df[term_id], term)
+            if best is None or key < best:
+                best = key
+        correction = best[2] if best is not None else None
+
+        with self._lock:
+            self._cache[token] = correction
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return correction
@@ -0,0 +1,87 @@
+"""Compressed storage for chunk text.
+
+Texts are grouped into fixed-size blocks of consecutive chunks, each block
+zlib-compressed as a JSON list and appended to one file. A small offset
+table maps a block number to its byte range, so reading one chunk
+decompresses only its block. Recently used blocks stay in an LRU cache;
+search results tend to cluster in the same files, and therefore blocks.
+"""
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+STORE_FILE_NAME = "chunks.zlib"
+STORE_OFFSETS_FILE_NAME = "chunks.offsets.json"
+STORE_BLOCK_CHUNKS = 32
+STORE_COMPRESSION_LEVEL = 9
+STORE_CACHE_BLOCKS = 64
+
+
+def write_chunk_store(texts: Sequence[str], index_dir: Path, block_chunks: int = STORE_BLOCK_CHUNKS) -> None:
+    """Write `texts` as compressed blocks plus their offset table into `index_dir`."""
+    offsets = [0]
+    with (index_dir / STORE_FILE_NAME).open("wb") as handle:
+        for start in range(0, len(texts), block_chunks):
+            block = json.dumps(list(texts[start:start + block_chunks]), ensure_ascii=False)
+            handle.write(zlib.compress(block.encode("utf-8"), STORE_COMPRESSION_LEVEL))
+            offsets.append(handle.tell())
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    table = {"block_chunks": block_chunks, "count": len(texts), "offsets": offsets}
+    with (index_dir / STORE_OFFSETS_FILE_NAME).open("w", encoding="utf-8") as handle:
+        handle.write(json.dumps(table, separators=(",", ":")))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+class ChunkStore:
+    def __init__(self, index_dir: Path, cache_blocks: int = STORE_CACHE_BLOCKS) -> None:
+        with (index_dir / STORE_OFFSETS_FILE_NAME).open("r", encoding="utf-8") as handle:
+            table = json.load(handle)
+        # Opened once: an open handle keeps reading the store even after a
+        # rebuild prunes this version's directory.
+        self._file = (index_dir / STORE_FILE_NAME).open("rb")
+        self._block_chunks: int = table["block_chunks"]
+        self._offsets: List[int] = table["offsets"]
+        self.count: int = table["count"]
+        self.cache_blocks = cache_blocks
+        self._cache: "OrderedDict[int, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Optional["ChunkStore"]:
+        if not (index_dir / STORE_FILE_NAME).exists() or not (index_dir / STORE_OFFSETS_FILE_NAME).exists():
+            return None
+        return cls(index_dir)
+
+    def _block(self, block: int) -> List[str]:
+        with self._lock:
+            cached = self._cache.get(block)
+            if cached is not None:
+                self._cache.move_to_end(block)
+                return cached
+
+        start, end = self._offsets[block], self._offsets[block + 1]
+        data = os.pread(self._file.fileno(), end - start, start)
+        texts = json.loads(zlib.decompress(data).decode("utf-8"))
+
+        with self._lock:
+            self._cache[block] = texts
+            while len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        return texts
+
+    def close(self) -> None:
+        self._file.close()
+
+    def text(self, idx: int) -> str:
+        """Return the text of chunk `idx`."""
+        if not 0 <= idx < self.count:
+            raise IndexError(idx)
+        block, position = divmod(idx, self._block_chunks)
+        return self._block(block)[position]
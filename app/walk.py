@@ -0,0 +1,157 @@
+import fnmatch
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Directories and files that never hold indexable DSL code. Directory
+# patterns prune the whole subtree, so nothing below them is ever listed.
+DEFAULT_EXCLUDES: Tuple[str, ...] = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    ".mypy_cache",
+    ".pytest_cache",
+    "__pycache__",
+    "node_modules",
+    "build",
+    "dist",
+    "*.egg-info",
+    "vendor",
+    "third_party",
+    "fixtures",
+    "testdata",
+)
+GITIGNORE_FILE = ".gitignore"
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    pattern: str
+    base: str
+    negate: bool = False
+    dir_only: bool = False
+    anchored: bool = False
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        if self.anchored:
+            return fnmatch.fnmatchcase(rel_path, self.pattern)
+        return fnmatch.fnmatchcase(rel_path.rsplit("/", 1)[-1], self.pattern)
+
+
+def parse_gitignore(text: str, base: str = "") -> List[IgnoreRule]:
+    """Parse the subset of gitignore syntax used in practice.
+
+    Supports comments, `!` negation, trailing `/` for directories and
+    anchoring (leading or inner `/`). `**` is treated like `*`.
+    """
+    rules: List[IgnoreRule] = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if line.startswith("**/"):
+            line = line[3:]
+        anchored = "/" in line
+        line = line.lstrip("/").replace("**", "*")
+        if line:
+            rules.append(IgnoreRule(line, base, negate, dir_only, anchored))
+    return rules
+
+
+def _is_ignored(rules: Sequence[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def _matches_any(patterns: Sequence[str], rel_path: str, name: str) -> bool:
+    for pattern in patterns:
+        target = rel_path if "/" in pattern else name
+        if fnmatch.fnmatchcase(target, pattern):
+            return True
+    return False
+
+
+def walk_repo(
+    root: Path,
+    include: Sequence[str],
+    exclude: Sequence[str] = DEFAULT_EXCLUDES,
+    use_gitignore: bool = True,
+) -> Iterator[Path]:
+    """Yield files under `root` matching `include`, in a stable order.
+
+    Uses `os.scandir` so file types come from the directory listing, and
+    prunes excluded or gitignored directories before descending into them.
+    """
+    stack: List[Tuple[str, str, Tuple[IgnoreRule, ...]]] = [(str(root), "", ())]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        try:
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        if use_gitignore and any(entry.name == GITIGNORE_FILE for entry in entries):
+            gitignore = Path(directory) / GITIGNORE_FILE
+            text = gitignore.read_text(encoding="utf-8", errors="ignore")
+            rules = rules + tuple(parse_gitignore(text, rel_dir))
+
+        subdirs: List[Tuple[str, str, Tuple[IgnoreRule, ...]]] = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if is_dir:
+                if _matches_any(exclude, rel_path, entry.name) or _is_ignored(rules, rel_path, True):
+                    continue
+                subdirs.append((entry.path, rel_path, rules))
+            elif is_file:
+                if not _matches_any(include, rel_path, entry.name):
+                    continue
+                if _matches_any(exclude, rel_path, entry.name) or _is_ignored(rules, rel_path, False):
+                    continue
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def list_repos(
+    repos: Dict[str, Tuple[Path, Sequence[str]]],
+    exclude: Sequence[str] = DEFAULT_EXCLUDES,
+    workers: int = 4,
+) -> Iterator[Tuple[str, List[Path]]]:
+    """List several repos concurrently, yielding `(name, files)` in input order.
+
+    The first repo's files are yielded as soon as its walk finishes, so the
+    caller can start chunking while the remaining repos are still listed.
+    """
+    names = list(repos)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names) or 1))) as executor:
+        futures = [
+            executor.submit(lambda item: list(walk_repo(item[0], item[1], exclude)), repos[name])
+            for name in names
+        ]
+        for name, future in zip(names, futures):
+            yield name, future.result()
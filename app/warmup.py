@@ -0,0 +1,55 @@
+"""Warm a freshly loaded `Retriever` with the queries real traffic sends.
+
+The request log (`app.reqlog`) records every search a turn ran. Replaying
+the most frequent ones fills the retriever's result cache, the positional
+postings cache and the chunk-store block cache before the API reports
+ready, so the first sessions after a restart or index swap are not cold.
+"""
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from app.guide import PROMPT_REPO, prompt_queries
+from app.retrieve import Retriever
+
+WARMUP_QUERIES = 200
+# Only the newest lines of each log file are read.
+WARMUP_MAX_LOG_LINES = 50_000
+
+WarmQuery = Tuple[str, int, Optional[str]]
+
+
+def _tail_lines(path: Path, limit: int) -> List[str]:
+    try:
+        with path.open("r", encoding="utf-8", errors="ignore") as handle:
+            lines = handle.readlines()
+    except OSError:
+        return []
+    return lines[-limit:]
+
+
+def frequent_queries(log_paths: Iterable[Path], limit: int = WARMUP_QUERIES) -> List[WarmQuery]:
+    """The `limit` most frequent `(query, top_k, repo)` searches in the request logs."""
+    counts: Counter = Counter()
+    for path in log_paths:
+        for line in _tail_lines(path, WARMUP_MAX_LOG_LINES):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            for search in record.get("searches", ()):
+                if search.get("query"):
+                    counts[(search["query"], search.get("top_k", 3), search.get("repo"))] += 1
+    return [query for query, _ in counts.most_common(limit)]
+
+
+def warm(retriever: Retriever, queries: Iterable[WarmQuery]) -> int:
+    """Run the guide's fixed prompt queries plus `queries`; returns how many ran."""
+    planned: List[WarmQuery] = [(query, 1, PROMPT_REPO) for query in prompt_queries()]
+    planned.extend(queries)
+    ran = 0
+    for query, top_k, repo in dict.fromkeys(planned):
+        retriever.search(query, top_k=top_k, repo=repo)
+        ran += 1
+    return ran
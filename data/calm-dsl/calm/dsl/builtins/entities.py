@@ -0,0 +1,26 @@
+
+class Service:
+    """Base service entity."""
+    name = ""
+
+class Package:
+    """Package entity."""
+
+class Substrate:
+    """Substrate entity."""
+    provider_type = "AHV_VM"
+
+class Deployment:
+    pass
+
+class Blueprint:
+    """Blueprint entity."""
+    services = []
+
+def action(func):
+    return func
+
+class Variable:
+    class Simple:
+        def __init__(self, value, runtime=False):
+            self.value = value
@@ -0,0 +1 @@
+# Empty module for testing the loading of modules
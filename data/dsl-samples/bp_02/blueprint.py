@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class NginxService(Service):
+    """nginx service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart nginx", script="systemctl restart nginx")
+
+class MysqlService(Service):
+    dependencies = [ref(NginxService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/mysql.tgz /var/lib/mysql")
+
+class NginxPackage(Package):
+    services = [ref(NginxService)]
+
+class NginxSubstrate(Substrate):
+    provider_type = "AHV_VM"
+    os_type = "Linux"
+
+class NginxDeployment(Deployment):
+    packages = [ref(NginxPackage)]
+    substrate = ref(NginxSubstrate)
+
+class Default(Profile):
+    deployments = [NginxDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out nginx"""
+        CalmTask.Scaling.scale_out(1, target=ref(NginxDeployment))
+
+class NginxMysqlBlueprint(Blueprint):
+    services = [NginxService, MysqlService]
+    packages = [NginxPackage]
+    substrates = [NginxSubstrate]
+    profiles = [Default]
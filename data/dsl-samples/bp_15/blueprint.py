@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class DbService(Service):
+    """db service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart db", script="systemctl restart db")
+
+class CacheService(Service):
+    dependencies = [ref(DbService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/cache.tgz /var/lib/cache")
+
+class DbPackage(Package):
+    services = [ref(DbService)]
+
+class DbSubstrate(Substrate):
+    provider_type = "VMWARE_VM"
+    os_type = "Linux"
+
+class DbDeployment(Deployment):
+    packages = [ref(DbPackage)]
+    substrate = ref(DbSubstrate)
+
+class Default(Profile):
+    deployments = [DbDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out db"""
+        CalmTask.Scaling.scale_out(1, target=ref(DbDeployment))
+
+class DbCacheBlueprint(Blueprint):
+    services = [DbService, CacheService]
+    packages = [DbPackage]
+    substrates = [DbSubstrate]
+    profiles = [Default]
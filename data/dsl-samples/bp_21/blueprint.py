@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class QueueService(Service):
+    """queue service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart queue", script="systemctl restart queue")
+
+class MysqlService(Service):
+    dependencies = [ref(QueueService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/mysql.tgz /var/lib/mysql")
+
+class QueuePackage(Package):
+    services = [ref(QueueService)]
+
+class QueueSubstrate(Substrate):
+    provider_type = "AWS_VM"
+    os_type = "Linux"
+
+class QueueDeployment(Deployment):
+    packages = [ref(QueuePackage)]
+    substrate = ref(QueueSubstrate)
+
+class Default(Profile):
+    deployments = [QueueDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out queue"""
+        CalmTask.Scaling.scale_out(1, target=ref(QueueDeployment))
+
+class QueueMysqlBlueprint(Blueprint):
+    services = [QueueService, MysqlService]
+    packages = [QueuePackage]
+    substrates = [QueueSubstrate]
+    profiles = [Default]
@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class TomcatService(Service):
+    """tomcat service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart tomcat", script="systemctl restart tomcat")
+
+class MysqlService(Service):
+    dependencies = [ref(TomcatService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/mysql.tgz /var/lib/mysql")
+
+class TomcatPackage(Package):
+    services = [ref(TomcatService)]
+
+class TomcatSubstrate(Substrate):
+    provider_type = "VMWARE_VM"
+    os_type = "Linux"
+
+class TomcatDeployment(Deployment):
+    packages = [ref(TomcatPackage)]
+    substrate = ref(TomcatSubstrate)
+
+class Default(Profile):
+    deployments = [TomcatDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out tomcat"""
+        CalmTask.Scaling.scale_out(1, target=ref(TomcatDeployment))
+
+class TomcatMysqlBlueprint(Blueprint):
+    services = [TomcatService, MysqlService]
+    packages = [TomcatPackage]
+    substrates = [TomcatSubstrate]
+    profiles = [Default]
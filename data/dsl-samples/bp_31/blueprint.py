@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class RedisService(Service):
+    """redis service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart redis", script="systemctl restart redis")
+
+class TomcatService(Service):
+    dependencies = [ref(RedisService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/tomcat.tgz /var/lib/tomcat")
+
+class RedisPackage(Package):
+    services = [ref(RedisService)]
+
+class RedisSubstrate(Substrate):
+    provider_type = "AHV_VM"
+    os_type = "Linux"
+
+class RedisDeployment(Deployment):
+    packages = [ref(RedisPackage)]
+    substrate = ref(RedisSubstrate)
+
+class Default(Profile):
+    deployments = [RedisDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out redis"""
+        CalmTask.Scaling.scale_out(1, target=ref(RedisDeployment))
+
+class RedisTomcatBlueprint(Blueprint):
+    services = [RedisService, TomcatService]
+    packages = [RedisPackage]
+    substrates = [RedisSubstrate]
+    profiles = [Default]
@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class MysqlService(Service):
+    """mysql service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart mysql", script="systemctl restart mysql")
+
+class RedisService(Service):
+    dependencies = [ref(MysqlService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/redis.tgz /var/lib/redis")
+
+class MysqlPackage(Package):
+    services = [ref(MysqlService)]
+
+class MysqlSubstrate(Substrate):
+    provider_type = "AWS_VM"
+    os_type = "Linux"
+
+class MysqlDeployment(Deployment):
+    packages = [ref(MysqlPackage)]
+    substrate = ref(MysqlSubstrate)
+
+class Default(Profile):
+    deployments = [MysqlDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out mysql"""
+        CalmTask.Scaling.scale_out(1, target=ref(MysqlDeployment))
+
+class MysqlRedisBlueprint(Blueprint):
+    services = [MysqlService, RedisService]
+    packages = [MysqlPackage]
+    substrates = [MysqlSubstrate]
+    profiles = [Default]
@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class WebService(Service):
+    """web service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart web", script="systemctl restart web")
+
+class MysqlService(Service):
+    dependencies = [ref(WebService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/mysql.tgz /var/lib/mysql")
+
+class WebPackage(Package):
+    services = [ref(WebService)]
+
+class WebSubstrate(Substrate):
+    provider_type = "VMWARE_VM"
+    os_type = "Linux"
+
+class WebDeployment(Deployment):
+    packages = [ref(WebPackage)]
+    substrate = ref(WebSubstrate)
+
+class Default(Profile):
+    deployments = [WebDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out web"""
+        CalmTask.Scaling.scale_out(1, target=ref(WebDeployment))
+
+class WebMysqlBlueprint(Blueprint):
+    services = [WebService, MysqlService]
+    packages = [WebPackage]
+    substrates = [WebSubstrate]
+    profiles = [Default]
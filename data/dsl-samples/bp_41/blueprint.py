@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class WorkerService(Service):
+    """worker service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart worker", script="systemctl restart worker")
+
+class MysqlService(Service):
+    dependencies = [ref(WorkerService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/mysql.tgz /var/lib/mysql")
+
+class WorkerPackage(Package):
+    services = [ref(WorkerService)]
+
+class WorkerSubstrate(Substrate):
+    provider_type = "AWS_VM"
+    os_type = "Linux"
+
+class WorkerDeployment(Deployment):
+    packages = [ref(WorkerPackage)]
+    substrate = ref(WorkerSubstrate)
+
+class Default(Profile):
+    deployments = [WorkerDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out worker"""
+        CalmTask.Scaling.scale_out(1, target=ref(WorkerDeployment))
+
+class WorkerMysqlBlueprint(Blueprint):
+    services = [WorkerService, MysqlService]
+    packages = [WorkerPackage]
+    substrates = [WorkerSubstrate]
+    profiles = [Default]
@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class CacheService(Service):
+    """cache service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart cache", script="systemctl restart cache")
+
+class DbService(Service):
+    dependencies = [ref(CacheService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/db.tgz /var/lib/db")
+
+class CachePackage(Package):
+    services = [ref(CacheService)]
+
+class CacheSubstrate(Substrate):
+    provider_type = "VMWARE_VM"
+    os_type = "Linux"
+
+class CacheDeployment(Deployment):
+    packages = [ref(CachePackage)]
+    substrate = ref(CacheSubstrate)
+
+class Default(Profile):
+    deployments = [CacheDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out cache"""
+        CalmTask.Scaling.scale_out(1, target=ref(CacheDeployment))
+
+class CacheDbBlueprint(Blueprint):
+    services = [CacheService, DbService]
+    packages = [CachePackage]
+    substrates = [CacheSubstrate]
+    profiles = [Default]
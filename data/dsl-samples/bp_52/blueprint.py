@@ -0,0 +1,42 @@
+from calm.dsl.builtins import Service, Package, Substrate, Deployment, Profile, Blueprint, action, Variable, ref
+
+class ApiService(Service):
+    """api service"""
+    port = Variable.Simple("80", runtime=True)
+
+    @action
+    def Restart():
+        CalmTask.Exec.ssh(name="restart api", script="systemctl restart api")
+
+class DbService(Service):
+    dependencies = [ref(ApiService)]
+
+    @action
+    def Backup():
+        CalmTask.Exec.ssh(name="backup", script="tar czf /tmp/db.tgz /var/lib/db")
+
+class ApiPackage(Package):
+    services = [ref(ApiService)]
+
+class ApiSubstrate(Substrate):
+    provider_type = "AHV_VM"
+    os_type = "Linux"
+
+class ApiDeployment(Deployment):
+    packages = [ref(ApiPackage)]
+    substrate = ref(ApiSubstrate)
+
+class Default(Profile):
+    deployments = [ApiDeployment]
+    nic = Variable.Simple("vlan0", runtime=True)
+
+    @action
+    def ScaleOut():
+        """Scale out api"""
+        CalmTask.Scaling.scale_out(1, target=ref(ApiDeployment))
+
+class ApiDbBlueprint(Blueprint):
+    services = [ApiService, DbService]
+    packages = [ApiPackage]
+    substrates = [ApiSubstrate]
+    profiles = [Default]
@@ -0,0 +1,50 @@
+import random
+from typing import List
+
+import pytest
+
+from app import index
+from app.index import Chunk
+
+VOCABULARY = [f"term{number}" for number in range(400)]
+REPOS = ("alpha", "beta")
+
+
+def make_chunks(count: int = 600, seed: int = 7) -> List[Chunk]:
+    """Python-like chunks over a Zipf-ish vocabulary, spread over two repos."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+    chunks = []
+    for number in range(count):
+        words = rng.choices(VOCABULARY, weights=weights, k=rng.randint(5, 60))
+        text = (
+            f"class Widget{number}(Base{number % 7}):\n"
+            f"    def run{number % 50}(self):\n"
+            f"        return {' '.join(words)}\n"
+        )
+        repo = REPOS[number % 3 == 0]
+        path = f"{repo}/module{number // 10}.py"
+        start = (number % 10) * 3 + 1
+        chunks.append(Chunk(repo, path, start, start + 2, text, [f"class:widget{number}"]))
+    return chunks
+
+
+@pytest.fixture
+def index_home(tmp_path, monkeypatch):
+    """Point every index path at a temporary directory."""
+    monkeypatch.setattr(index, "INDEX_DIR", tmp_path)
+    monkeypatch.setattr(index, "VERSIONS_DIR", tmp_path / "versions")
+    monkeypatch.setattr(index, "CURRENT_FILE", tmp_path / "CURRENT")
+    monkeypatch.setattr(index, "LEASES_DIR", tmp_path / "leases")
+    return tmp_path
+
+
+@pytest.fixture
+def chunks():
+    return make_chunks()
+
+
+@pytest.fixture
+def queries():
+    rng = random.Random(11)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 8))) for _ in range(200)]
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+from app.index import CHUNK_LINE_SIZE, PY_CLASS_MAX_LINES, YAML_CHUNK_MAX_LINES, _chunk_file
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+
+def long_class(name: str) -> str:
+    methods = "".join(
+        f"    @action\n    def step{number}(self, value):\n        return value + {number}\n\n"
+        for number in range(PY_CLASS_MAX_LINES // 3)
+    )
+    return f"class {name}(Service):\n    \"\"\"Docstring.\"\"\"\n\n    port = 80\n\n{methods}"
+
+
+PYTHON = (
+    "import os\n\nfrom calm.dsl.builtins import Service, action\n\nPORT = 80\n\n\n"
+    + long_class("Web")
+    + "\nif os.environ.get('DEBUG'):\n    PORT = 8080\n\n\n@decorate\ndef helper(a, b):\n    return a + b\n"
+)
+BROKEN_PYTHON = PYTHON.replace("def helper(a, b):", "def helper(a, b)") + "\n" + long_class("Db")
+YAML = "".join(
+    f"{key}:\n" + "".join(f"  - name: item{number}\n    type: t{number}\n" for number in range(YAML_CHUNK_MAX_LINES))
+    for key in ("name", "services", "profiles", "misc")
+)
+TEXT = "".join(f"line {number}\n" + ("\n" if number % 17 == 0 else "") for number in range(CHUNK_LINE_SIZE * 2 + 5))
+
+
+def assert_covered(path: Path) -> None:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    spans, _, _ = _chunk_file(path)
+    assert spans
+    covered = set()
+    for start, end, text in spans:
+        assert 1 <= start <= end <= len(lines)
+        assert text == "\n".join(lines[start - 1:end]).strip()
+        covered.update(range(start, end + 1))
+    missing = [number for number, line in enumerate(lines, start=1) if line.strip() and number not in covered]
+    assert not missing, f"{path.name}: lines {missing[:10]} are in no chunk"
+
+
+@pytest.mark.parametrize(
+    "name, content",
+    [("service.py", PYTHON), ("broken.py", BROKEN_PYTHON), ("blueprint.yaml", YAML), ("notes.txt", TEXT)],
+)
+def test_chunks_cover_every_line(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    assert_covered(path)
+
+
+@pytest.mark.parametrize("path", sorted(APP_DIR.glob("*.py")), ids=lambda path: path.name)
+def test_chunks_cover_every_line_of_app(path):
+    assert_covered(path)
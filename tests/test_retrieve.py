@@ -0,0 +1,85 @@
+import pytest
+
+from app import retrieve
+from app.index import write_index
+from app.retrieve import SEARCH_MAX_TERMS, STAGE_SCORED, Retriever
+
+# Generous enough that no query in these tests runs out of time.
+NO_DEADLINE = 60.0
+
+
+def ranked(results):
+    return [(result.chunk_id, round(result.score, 9)) for result in results]
+
+
+def test_wand_matches_exhaustive(index_home, chunks, queries, monkeypatch):
+    monkeypatch.setattr(retrieve, "WAND_MIN_POSTINGS", 0)
+    retriever = Retriever(write_index(chunks), dense=False)
+    try:
+        for name in retriever.corpora:
+            (corpus,) = retriever.corpus(name)
+            for query in queries:
+                for top_k in (1, 3, 10):
+                    wand = corpus.rank(query, top_k, budget_seconds=NO_DEADLINE)
+                    exhaustive = corpus.rank(query, top_k, exhaustive=True, budget_seconds=NO_DEADLINE)
+                    assert ranked(corpus.results(wand)) == ranked(corpus.results(exhaustive)), query
+    finally:
+        retriever.close()
+
+
+@pytest.mark.parametrize("shards", [2, 3])
+def test_sharded_matches_unsharded(index_home, chunks, queries, shards):
+    unsharded = Retriever(write_index(chunks), dense=False)
+    sharded = Retriever(write_index(chunks, shards=shards), dense=False)
+    try:
+        assert all(len(sharded.corpus(name)) == shards for name in sharded.corpora)
+        for query in queries + ["class Widget12", "def run3"]:
+            for top_k in (1, 3, 10):
+                for repo in (None, "alpha", "beta"):
+                    expected = unsharded.search(query, top_k, repo, budget_seconds=NO_DEADLINE)
+                    actual = sharded.search(query, top_k, repo, budget_seconds=NO_DEADLINE)
+                    assert ranked(actual) == ranked(expected), (query, top_k, repo)
+        for chunk in chunks[::37]:
+            assert sharded.get_chunk(chunk.chunk_id)["text"] == chunk.text
+    finally:
+        unsharded.close()
+        sharded.close()
+
+
+@pytest.fixture
+def corpus(index_home, chunks):
+    retriever = Retriever(write_index(chunks), dense=False)
+    yield retriever.corpus("alpha")[0]
+    retriever.close()
+
+
+def test_complete_search_is_not_partial(corpus):
+    ranking = corpus.rank("term3 term40 term200", 5, budget_seconds=NO_DEADLINE)
+    assert ranking.stage == STAGE_SCORED
+    assert ranking.docs
+    assert not corpus.results(ranking).partial
+
+
+def test_spent_deadline_sets_partial(corpus):
+    assert corpus.search("term3 term40 term200", 5, budget_seconds=0).partial
+
+
+def test_too_many_terms_sets_partial(corpus):
+    query = " ".join(f"term{number}" for number in range(SEARCH_MAX_TERMS + 5))
+    results = corpus.search(query, 5, budget_seconds=NO_DEADLINE)
+    assert results.partial
+    assert results
+
+
+def test_too_many_typos_sets_partial(corpus):
+    query = " ".join(f"trem{number}x" for number in range(SEARCH_MAX_TERMS + 5))
+    assert corpus.search(query, 5, budget_seconds=NO_DEADLINE).partial
+
+
+def test_partial_results_are_not_cached(index_home, chunks):
+    retriever = Retriever(write_index(chunks), dense=False)
+    try:
+        assert retriever.search("term3 term40 term200", 5, budget_seconds=0).partial
+        assert not retriever.search("term3 term40 term200", 5, budget_seconds=NO_DEADLINE).partial
+    finally:
+        retriever.close()
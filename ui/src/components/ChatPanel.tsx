@@ -4,6 +4,7 @@ import ResponseQualityLab from './ResponseQualityLab'
 type MessageType = 'user' | 'ai' | 'system'
 
 type Evidence = {
+  chunk_id?: string
   title: string
   file_path: string
   line_range: string
@@ -23,6 +24,7 @@ type ApiResponse = {
   draft_snapshot?: Record<string, unknown>
   step?: string
   evidence?: Evidence[]
+  partial?: boolean
 }
 
 const API_BASE = import.meta.env.VITE_API_BASE ?? 'http://127.0.0.1:8001'
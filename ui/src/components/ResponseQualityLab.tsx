@@ -1,6 +1,7 @@
 import { useEffect, useMemo, useRef, useState } from 'react'
 
 type Evidence = {
+  chunk_id?: string
   title: string
   file_path: string
   line_range: string